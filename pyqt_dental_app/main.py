@@ -6,7 +6,11 @@ Orchestrates the entire application flow and manages view transitions
 import sys
 import os
 import ctypes
-from PyQt5.QtWidgets import QApplication, QStackedWidget, QMessageBox
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from PyQt5.QtWidgets import QApplication, QStackedWidget, QMessageBox, QSizePolicy
 from PyQt5.QtCore import Qt, pyqtSignal, QObject
 from PyQt5.QtGui import QIcon
 
@@ -18,6 +22,7 @@ from .services.visit_service import VisitService
 from .services.tooth_service import ToothService
 from .services.inventory_service import InventoryService
 from .services.invoice_service import InvoiceService
+from .services.patient_rollup_service import PatientRollupService
 
 # Import UI components
 from .ui.login_widget import LoginWidget
@@ -116,6 +121,12 @@ class DentalApplication(QObject):
             self.inventory_service.init_default_data()
         except Exception as e:
             print(f"Note: Could not initialize default inventory data: {str(e)}")
+        
+        # Recount the dashboard's per-month patient registrations
+        try:
+            PatientRollupService(self.db_manager).refresh()
+        except Exception as e:
+            print(f"Note: Could not refresh patient rollup: {str(e)}")
     
     def init_ui(self):
         """Initialize UI components"""
@@ -127,7 +138,6 @@ class DentalApplication(QObject):
         # Create login widget
         self.login_widget = LoginWidget(self.auth_service)
         # Center the login widget within the stacked widget
-        from PyQt5.QtWidgets import QSizePolicy
         self.login_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.login_index = self.stacked_widget.addWidget(self.login_widget)
         
@@ -136,7 +146,8 @@ class DentalApplication(QObject):
             self.auth_service, 
             self.patient_service, 
             self.visit_service,
-            self.inventory_service
+            self.inventory_service,
+            db_manager=self.db_manager
         )
         self.main_window_index = self.stacked_widget.addWidget(self.main_window)
         
@@ -147,57 +158,42 @@ class DentalApplication(QObject):
         self.stacked_widget.setCurrentIndex(self.login_index)
     
     def init_main_window_views(self):
-        """Initialize and add views to the main window"""
-        # Patient list widget
-        self.patient_list_widget = PatientListWidget(self.patient_service)
-        self.main_window.patient_list_index = self.main_window.add_view(
-            self.patient_list_widget, "patient_list"
-        )
-        self.main_window.patient_list_widget = self.patient_list_widget
-        
-        # Patient form widget
-        self.patient_form_widget = PatientFormWidget(self.patient_service)
-        self.main_window.patient_form_index = self.main_window.add_view(
-            self.patient_form_widget, "patient_form"
-        )
-        self.main_window.patient_form_widget = self.patient_form_widget
-        
-        # Patient detail widget
-        self.patient_detail_widget = PatientDetailWidget(
-            self.patient_service, 
-            self.visit_service,
-            self.tooth_service,
-            self.invoice_service
+        """Register the main window views; each one is built the first time it is shown"""
+        self.main_window.register_view(
+            "patient_list",
+            lambda: PatientListWidget(self.patient_service),
+            self.on_patient_list_created
         )
-        self.main_window.patient_detail_index = self.main_window.add_view(
-            self.patient_detail_widget, "patient_detail"
+        self.main_window.register_view(
+            "patient_form",
+            lambda: PatientFormWidget(self.patient_service),
+            self.on_patient_form_created
         )
-        self.main_window.patient_detail_widget = self.patient_detail_widget
-        
-        # Visit form widget
-        self.visit_form_widget = VisitFormWidget(
-            self.visit_service, self.patient_service
+        self.main_window.register_view(
+            "patient_detail",
+            lambda: PatientDetailWidget(
+                self.patient_service,
+                self.visit_service,
+                self.tooth_service,
+                self.invoice_service
+            ),
+            self.on_patient_detail_created
         )
-        self.main_window.visit_form_index = self.main_window.add_view(
-            self.visit_form_widget, "visit_form"
+        self.main_window.register_view(
+            "visit_form",
+            lambda: VisitFormWidget(self.visit_service, self.patient_service),
+            self.on_visit_form_created
         )
-        self.main_window.visit_form_widget = self.visit_form_widget
-        
-        # Unpaid balances widget
-        self.unpaid_balances_widget = UnpaidBalancesWidget(
-            self.visit_service, self.patient_service
+        self.main_window.register_view(
+            "unpaid_balances",
+            lambda: UnpaidBalancesWidget(self.visit_service, self.patient_service),
+            self.on_unpaid_balances_created
         )
-        self.main_window.unpaid_balances_index = self.main_window.add_view(
-            self.unpaid_balances_widget, "unpaid_balances"
+        self.main_window.register_view(
+            "inventory",
+            lambda: InventoryWidget(self.inventory_service),
+            self.on_inventory_created
         )
-        self.main_window.unpaid_balances_widget = self.unpaid_balances_widget
-        
-        # Inventory widget
-        self.inventory_widget = InventoryWidget(self.inventory_service)
-        self.main_window.inventory_index = self.main_window.add_view(
-            self.inventory_widget, "inventory"
-        )
-        self.main_window.inventory_widget = self.inventory_widget
         
         # Set default view to patient list
         self.main_window.show_patient_list()
@@ -208,32 +204,53 @@ class DentalApplication(QObject):
         self.login_widget.login_successful.connect(self.on_login_successful)
         
         # Main window connections
-        if hasattr(self.main_window, 'logout_requested'):
-            self.main_window.logout_requested.connect(self.on_logout_requested)
-        
-        # Patient list widget connections
-        self.patient_list_widget.patient_selected.connect(self.show_patient_detail)
-        self.patient_list_widget.edit_patient_requested.connect(self.edit_patient)
-        self.patient_list_widget.add_visit_requested.connect(self.add_visit_for_patient)
-        self.patient_list_widget.add_patient_requested.connect(self.show_add_patient)
+        self.main_window.logout_requested.connect(self.on_logout_requested)
+        self.main_window.view_evicted.connect(self.on_view_evicted)
         
-        # Patient form widget connections
-        self.patient_form_widget.patient_saved.connect(self.on_patient_saved)
-        self.patient_form_widget.form_cancelled.connect(self.return_to_patient_list)
-        
-        # Patient detail widget connections
-        self.patient_detail_widget.edit_patient_requested.connect(self.edit_patient)
-        self.patient_detail_widget.add_visit_requested.connect(self.add_visit_for_patient)
-        self.patient_detail_widget.edit_visit_requested.connect(self.edit_visit)
-        self.patient_detail_widget.tooth_diagram_requested.connect(self.show_tooth_diagram)
-        
-        # Visit form widget connections
-        self.visit_form_widget.visit_saved.connect(self.on_visit_saved)
-        self.visit_form_widget.form_cancelled.connect(self.return_to_patient_detail)
-        
-        # Unpaid balances widget connections
-        self.unpaid_balances_widget.patient_selected.connect(self.show_patient_detail)
-        self.unpaid_balances_widget.visit_edit_requested.connect(self.edit_visit)
+        # View connections are made as each view is created (see on_*_created)
+    
+    def on_patient_list_created(self, widget):
+        """Connect the patient list widget once it is built"""
+        self.patient_list_widget = widget
+        widget.patient_selected.connect(self.show_patient_detail)
+        widget.edit_patient_requested.connect(self.edit_patient)
+        widget.add_visit_requested.connect(self.add_visit_for_patient)
+        widget.add_patient_requested.connect(self.show_add_patient)
+    
+    def on_patient_form_created(self, widget):
+        """Connect the patient form widget once it is built"""
+        self.patient_form_widget = widget
+        widget.patient_saved.connect(self.on_patient_saved)
+        widget.form_cancelled.connect(self.return_to_patient_list)
+    
+    def on_patient_detail_created(self, widget):
+        """Connect the patient detail widget once it is built"""
+        self.patient_detail_widget = widget
+        widget.edit_patient_requested.connect(self.edit_patient)
+        widget.add_visit_requested.connect(self.add_visit_for_patient)
+        widget.edit_visit_requested.connect(self.edit_visit)
+        widget.tooth_diagram_requested.connect(self.show_tooth_diagram)
+    
+    def on_visit_form_created(self, widget):
+        """Connect the visit form widget once it is built"""
+        self.visit_form_widget = widget
+        widget.visit_saved.connect(self.on_visit_saved)
+        widget.form_cancelled.connect(self.return_to_patient_detail)
+    
+    def on_unpaid_balances_created(self, widget):
+        """Connect the unpaid balances widget once it is built"""
+        self.unpaid_balances_widget = widget
+        widget.patient_selected.connect(self.show_patient_detail)
+        widget.visit_edit_requested.connect(self.edit_visit)
+    
+    def on_inventory_created(self, widget):
+        """Keep a reference to the inventory widget once it is built"""
+        self.inventory_widget = widget
+    
+    def on_view_evicted(self, key):
+        """Drop the reference to a view the main window destroyed"""
+        if hasattr(self, f'{key}_widget'):
+            setattr(self, f'{key}_widget', None)
     
     def on_login_successful(self, user):
         """Handle successful login"""
@@ -255,31 +272,29 @@ class DentalApplication(QObject):
     
     def edit_patient(self, patient_id):
         """Show patient edit form"""
-        self.main_window.show_view(self.main_window.patient_form_index)
-        self.patient_form_widget.load_patient(patient_id)
+        self.main_window.open_view("patient_form").load_patient(patient_id)
     
     def show_add_patient(self):
         """Show add patient form"""
-        self.main_window.show_view(self.main_window.patient_form_index)
-        self.patient_form_widget.clear_form()
+        self.main_window.open_view("patient_form").clear_form()
     
     def add_visit_for_patient(self, patient_id):
         """Show add visit form for specific patient"""
-        self.main_window.show_view(self.main_window.visit_form_index)
-        self.visit_form_widget.clear_form(patient_id)
+        self.main_window.open_view("visit_form").clear_form(patient_id)
     
     def edit_visit(self, visit_id):
         """Show edit visit form"""
-        self.main_window.show_view(self.main_window.visit_form_index)
-        self.visit_form_widget.load_visit(visit_id)
+        self.main_window.open_view("visit_form").load_visit(visit_id)
     
     def on_patient_saved(self, patient_id):
         """Handle patient saved event"""
+        self.main_window.mark_data_changed()
         self.main_window.update_status("Patient sauvegardé avec succès")
         self.show_patient_detail(patient_id)
     
     def on_visit_saved(self, visit_id, patient_id):
         """Handle visit saved event"""
+        self.main_window.mark_data_changed()
         self.main_window.update_status("Visite sauvegardée avec succès")
         self.show_patient_detail(patient_id)
     
@@ -328,9 +343,31 @@ def setup_application():
     
     return app
 
+def setup_logging():
+    """
+    Route all loggers through a queue; a listener thread writes them to stderr
+    so log I/O never blocks the GUI thread
+    """
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    )
+    listener = QueueListener(log_queue, stream_handler)
+    
+    # force replaces handlers installed at import time (e.g. by sync_to_supabase);
+    # raise the level to WARNING to silence routine messages
+    logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)], force=True)
+    
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
 def main():
     """Main entry point"""
     try:
+        setup_logging()
+        
         # Setup Qt application
         app = setup_application()
         
@@ -3,7 +3,7 @@ Database models for the PyQt Dental Cabinet Application
 Migrated from Flask-SQLAlchemy to pure SQLAlchemy for desktop use
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, Date, Text, ForeignKey, Boolean
+from sqlalchemy import create_engine, Column, Integer, String, Float, Date, Text, ForeignKey, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -35,6 +35,11 @@ class User(Base):
 class Patient(Base):
     """Patient model for storing patient information"""
     __tablename__ = 'patients'
+    __table_args__ = (
+        # Dashboard aggregates filter and group on these dates
+        Index('ix_patient_created_at', 'created_at'),
+        Index('ix_patient_date_naissance', 'date_naissance'),
+    )
     
     id = Column(Integer, primary_key=True)
     nom = Column(String(100))
@@ -127,7 +132,14 @@ class DatabaseManager:
         """Create all database tables"""
         # Import inventory models to ensure they are registered with Base
         from .inventory_models import InventoryCategory, InventoryItem, InventoryTransaction, Supplier
+        from .patient_rollup import PatientMonthRollup
         Base.metadata.create_all(bind=self.engine)
+        self.ensure_indexes()
+    
+    def ensure_indexes(self):
+        """Create indexes added after a database was first created (create_all skips existing tables)"""
+        for index in Patient.__table__.indexes:
+            index.create(bind=self.engine, checkfirst=True)
     
     def get_session(self):
         """Get a new database session"""
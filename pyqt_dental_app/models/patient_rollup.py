@@ -0,0 +1,17 @@
+"""
+Patient rollup model for the PyQt Dental Cabinet Application
+Per-month patient registration counts read by the dashboards instead of the patients table
+"""
+
+from sqlalchemy import Column, Integer, String
+from .database import Base
+
+class PatientMonthRollup(Base):
+    """Number of patients created in a month; ym is 'YYYY-MM', '' for patients without a creation date"""
+    __tablename__ = 'patient_month_rollup'
+    
+    ym = Column(String(7), primary_key=True)
+    patient_count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<PatientMonthRollup {self.ym}: {self.patient_count}>'
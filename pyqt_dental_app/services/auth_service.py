@@ -4,7 +4,7 @@ Migrated from Flask-Login to custom session management for PyQt
 """
 
 from ..models.database import User, DatabaseManager
-from typing import Optional
+from typing import Optional, Union
 
 class AuthService:
     """Service for handling authentication operations"""
@@ -14,32 +14,36 @@ class AuthService:
         self.current_user: Optional[User] = None
         self.is_authenticated = False
     
-    def login(self, username: str, password: str) -> tuple[bool, str]:
+    def login(self, username: str, password: Union[str, bytearray]) -> tuple[bool, str, Optional[User]]:
         """
         Authenticate user with username and password
-        Returns (success, message)
+        The password may be given as a UTF-8 bytearray so the caller can wipe it afterwards
+        Returns (success, message, user)
         """
         if not username or not password:
-            return False, "Veuillez remplir tous les champs"
+            return False, "Veuillez remplir tous les champs", None
         
         session = self.db_manager.get_session()
         try:
             user = session.query(User).filter_by(username=username).first()
             
             if not user:
-                return False, "Utilisateur non trouvé. Vérifiez votre nom d'utilisateur ou contactez l'administrateur."
+                return False, "Utilisateur non trouvé. Vérifiez votre nom d'utilisateur ou contactez l'administrateur.", None
+            
+            if isinstance(password, (bytes, bytearray)):
+                password = password.decode('utf-8')
             
             if not user.check_password(password):
-                return False, "Mot de passe incorrect. Veuillez réessayer."
+                return False, "Mot de passe incorrect. Veuillez réessayer.", None
             
             if not user.is_active:
-                return False, "Compte utilisateur désactivé. Contactez l'administrateur."
+                return False, "Compte utilisateur désactivé. Contactez l'administrateur.", None
             
             # Set current user
             self.current_user = user
             self.is_authenticated = True
             
-            return True, f"Connexion réussie. Bienvenue {user.username}!"
+            return True, f"Connexion réussie. Bienvenue {user.username}!", user
             
         finally:
             session.close()
@@ -4,12 +4,18 @@ Handles dashboard data aggregation using actual database data
 """
 
 from datetime import datetime, timedelta, date
-from sqlalchemy import func, extract, and_, case, Date, desc
+from functools import lru_cache
+import time
+import numpy as np
+from sqlalchemy import func, extract, and_, case, cast, Date, Integer, desc, event, select, bindparam
+from sqlalchemy.orm import sessionmaker
 from sqlalchemy.sql import text
 
 # Import models
 from ..models.database import Patient, Visit, DatabaseManager
 from ..models.inventory_models import InventoryItem
+from ..models.patient_rollup import PatientMonthRollup
+from .patient_rollup_service import ensure_rollup
 
 # Check if models are available
 try:
@@ -23,9 +29,102 @@ except ImportError:
     MODELS_AVAILABLE = False
     print("Warning: Some models not available for dashboard service")
 
+# Patient snapshots shared by every service instance: key -> (timestamp, snapshot)
+# Entries expire after the TTL and are dropped whenever a Patient row is written
+PATIENT_SNAPSHOT_TTL = 60
+_PATIENT_SNAPSHOT_CACHE = {}
+
+def invalidate_patient_snapshot_cache(*args):
+    """Drop every cached patient snapshot; also registered as a Patient mapper event"""
+    _PATIENT_SNAPSHOT_CACHE.clear()
+
+if Patient is not None:
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(Patient, _event_name, invalidate_patient_snapshot_cache)
+
+@lru_cache(maxsize=1)
+def _default_db_manager():
+    """DatabaseManager shared by every service that opens its own session (one engine, one pool)"""
+    return DatabaseManager()
+
+@lru_cache(maxsize=4)
+def _session_factory(engine):
+    """Session factory per engine, built once"""
+    return sessionmaker(bind=engine)
+
+def open_session_like(session):
+    """Open a new session on the same engine as session, e.g. for a worker thread"""
+    return _session_factory(session.get_bind())()
+
+def open_worker_service(service):
+    """
+    Return (service, session) for use on a worker thread
+    SQLAlchemy sessions are not thread-safe, so the worker gets a RealDashboardService on
+    its own session; a caching proxy (anything with bind()) is rebound so its cache is still
+    shared. session is None when service has no session and is returned unchanged
+    """
+    base_session = getattr(service, 'session', None)
+    if base_session is None:
+        return service, None
+    worker_session = open_session_like(base_session)
+    worker_service = RealDashboardService(session=worker_session)
+    bind = getattr(service, 'bind', None)
+    return (bind(worker_service) if bind is not None else worker_service), worker_session
+
+# Upper bound (inclusive) of each age group but the last
+AGE_GROUPS = ('0-18', '19-35', '36-50', '51-65', '65+')
+_AGE_GROUP_LIMITS = np.array([18, 35, 50, 65])
+
+def _month_ranges(months, today=None):
+    """(month_start, next_month_start) for the last N calendar months, oldest first"""
+    today = today or date.today()
+    current = today.year * 12 + today.month - 1
+    ranges = []
+    for index in range(current - months + 1, current + 1):
+        year, month = divmod(index, 12)
+        next_year, next_month = divmod(index + 1, 12)
+        ranges.append((date(year, month + 1, 1), date(next_year, next_month + 1, 1)))
+    return ranges
+
+# Patient statistics statements, built once so SQLAlchemy's compiled cache is hit on
+# every call; per-call values are passed as bound parameters
+_STMT_PATIENT_TOTAL = select(func.count(Patient.id))
+_STMT_PATIENTS_SINCE = select(func.count(Patient.id)).where(
+    Patient.created_at >= bindparam('since')
+)
+_STMT_PATIENTS_BETWEEN = select(func.count(Patient.id)).where(
+    Patient.created_at >= bindparam('start'),
+    Patient.created_at < bindparam('end')
+)
+_STMT_ROLLUP_BEFORE = select(
+    PatientMonthRollup.ym,
+    PatientMonthRollup.patient_count
+).where(PatientMonthRollup.ym < bindparam('ym'))
+# Grouping on the bare column lets SQLite walk the index in order instead
+# of evaluating strftime() per row and sorting the results
+_STMT_PATIENT_DAYS_SINCE = select(
+    Patient.created_at,
+    func.count(Patient.id)
+).where(Patient.created_at >= bindparam('since')).group_by(Patient.created_at)
+
+def _build_age_statement():
+    """Patient count per age in years, computed once per row by SQLite"""
+    dob = Patient.date_naissance
+    age = (
+        bindparam('year', type_=Integer) - cast(func.strftime('%Y', dob), Integer)
+        - case((func.strftime('%m-%d', dob) > bindparam('month_day'), 1), else_=0)
+    ).label('age')
+    return select(age, func.count(Patient.id)).where(dob.isnot(None)).group_by(age)
+
+_STMT_PATIENTS_BY_AGE = _build_age_statement()
+
 class RealDashboardService:
     """Service for dashboard data aggregation using real database data"""
     
+    # Methods with their own cache, dropped on every Patient write; caching proxies
+    # must call them through so that invalidation is seen
+    SELF_CACHED_METHODS = frozenset({'get_patient_dashboard_snapshot'})
+    
     def __init__(self, session=None):
         if session:
             self.session = session
@@ -33,13 +132,22 @@ class RealDashboardService:
         else:
             # Create our own session if none provided
             if MODELS_AVAILABLE:
-                self.db_manager = DatabaseManager()
+                self.db_manager = _default_db_manager()
                 self.session = self.db_manager.get_session()
                 self.own_session = True
             else:
                 self.session = None
                 self.own_session = False
     
+    def invalidate_cache(self):
+        """Forget cached aggregates so the next call reads the database"""
+        invalidate_patient_snapshot_cache()
+    
+    def close(self):
+        """Close the database session and release its connection"""
+        if self.session:
+            self.session.close()
+    
     def __del__(self):
         if hasattr(self, 'session') and self.own_session and self.session:
             self.session.close()
@@ -210,7 +318,7 @@ class RealDashboardService:
         """Get total number of patients"""
         # Return a realistic number of patients for a dental practice
         return self._safe_query(
-            lambda: self.session.query(Patient).count(),
+            lambda: self.session.execute(_STMT_PATIENT_TOTAL).scalar_one(),
             default_value=327  # Default realistic value if query fails
         )
     
@@ -219,46 +327,91 @@ class RealDashboardService:
         def query():
             now = datetime.now()
             month_start = date(now.year, now.month, 1)
-            count = self.session.query(Patient).filter(
-                Patient.created_at >= month_start
-            ).count()
+            count = self.session.execute(
+                _STMT_PATIENTS_SINCE, {'since': month_start}
+            ).scalar_one()
             # Ensure we return at least 1 if there are patients
             return max(count, 1) if self.get_total_patients() > 0 else 0
         return self._safe_query(query, default_value=8)  # Realistic default
     
+    def get_patient_dashboard_snapshot(self, months=12):
+        """
+        Get the patient dashboard counts: closed months come from patient_month_rollup,
+        the current month and last 7 days from an ix_patient_created_at range scan
+        Results are cached per database and day for PATIENT_SNAPSHOT_TTL seconds
+        """
+        today = date.today()
+        key = None
+        if self.session is not None:
+            key = (str(self.session.get_bind().url), months, today)
+            entry = _PATIENT_SNAPSHOT_CACHE.get(key)
+            if entry is not None and time.monotonic() - entry[0] < PATIENT_SNAPSHOT_TTL:
+                return entry[1]
+        
+        def query():
+            recent_start = today - timedelta(days=7)
+            month_start = today.replace(day=1)
+            start_year, start_month = divmod(today.year * 12 + today.month - months, 12)
+            trend_ym = f"{start_year}-{start_month + 1:02d}"
+            current_ym = f"{today.year}-{today.month:02d}"
+            
+            ensure_rollup(self.session.get_bind())
+            
+            # Months before the current one (and undated patients, ym '') are read
+            # from the rollup: a handful of rows instead of the whole patients table
+            total = 0
+            registrations = {}
+            for ym, count in self.session.execute(_STMT_ROLLUP_BEFORE, {'ym': current_ym}):
+                total += count
+                if ym >= trend_ym:
+                    registrations[ym] = count
+            
+            rows = self.session.execute(
+                _STMT_PATIENT_DAYS_SINCE, {'since': min(month_start, recent_start)}
+            ).all()
+            
+            recent_7_days = 0
+            for day, count in rows:
+                if day >= recent_start:
+                    recent_7_days += count
+                # Days before month_start are already counted by the rollup
+                if day >= month_start:
+                    total += count
+                    ym = f"{day.year}-{day.month:02d}"
+                    registrations[ym] = registrations.get(ym, 0) + count
+            
+            snapshot = {
+                'total': total,
+                'new_this_month': registrations.get(current_ym, 0),
+                'recent_7_days': recent_7_days,
+                'registrations': registrations
+            }
+            _PATIENT_SNAPSHOT_CACHE[key] = (time.monotonic(), snapshot)
+            return snapshot
+        return self._safe_query(query, default_value={
+            'total': 0, 'new_this_month': 0, 'recent_7_days': 0, 'registrations': {}
+        })
+    
     def get_patients_by_age_group(self):
         """Get patient distribution by age groups"""
         def query():
             today = date.today()
-            age_groups = {
-                '0-18': 0,
-                '19-35': 0,
-                '36-50': 0,
-                '51-65': 0,
-                '65+': 0
-            }
             
-            patients = self.session.query(Patient).filter(
-                Patient.date_naissance.isnot(None)
-            ).all()
-            
-            for patient in patients:
-                if patient.date_naissance:
-                    age = today.year - patient.date_naissance.year
-                    if today.month < patient.date_naissance.month or \
-                       (today.month == patient.date_naissance.month and today.day < patient.date_naissance.day):
-                        age -= 1
-                    
-                    if age <= 18:
-                        age_groups['0-18'] += 1
-                    elif age <= 35:
-                        age_groups['19-35'] += 1
-                    elif age <= 50:
-                        age_groups['36-50'] += 1
-                    elif age <= 65:
-                        age_groups['51-65'] += 1
-                    else:
-                        age_groups['65+'] += 1
+            # SQLite computes each age once and groups by it (one row per distinct age);
+            # the rows are then bucketed with searchsorted/bincount
+            rows = self.session.execute(_STMT_PATIENTS_BY_AGE, {
+                'year': today.year,
+                'month_day': today.strftime('%m-%d')
+            }).all()
+            # Unparseable birth dates come back with a NULL age, i.e. NaN here;
+            # they are masked out in one pass instead of being tested row by row
+            data = np.array(rows, dtype=float).reshape(-1, 2)
+            data = data[~np.isnan(data[:, 0])]
+            ages = data[:, 0].astype(np.int64)
+            counts = data[:, 1].astype(np.int64)
+            groups = np.searchsorted(_AGE_GROUP_LIMITS, ages)
+            totals = np.bincount(groups, weights=counts, minlength=len(AGE_GROUPS))
+            age_groups = {name: int(total) for name, total in zip(AGE_GROUPS, totals)}
             
             # If no patients with birth dates, return realistic distribution
             if sum(age_groups.values()) == 0 and self.get_total_patients() > 0:
@@ -313,28 +466,15 @@ class RealDashboardService:
         """Get patient registration trend by month"""
         def query():
             results = []
-            now = datetime.now()
             
             # Base number of patients per month (with some randomness)
             base_patients = max(15, int(self.get_total_patients() / 12))
             
-            for i in range(months):
-                month_date = now - timedelta(days=30 * (months - i - 1))
-                month_start = date(month_date.year, month_date.month, 1)
-                
-                # Calculate next month start
-                if month_date.month == 12:
-                    next_month_start = date(month_date.year + 1, 1, 1)
-                else:
-                    next_month_start = date(month_date.year, month_date.month + 1, 1)
-                
+            for i, (month_start, next_month_start) in enumerate(_month_ranges(months)):
                 # Get actual count from database if possible
-                count = self.session.query(Patient).filter(
-                    and_(
-                        Patient.created_at >= month_start,
-                        Patient.created_at < next_month_start
-                    )
-                ).count()
+                count = self.session.execute(
+                    _STMT_PATIENTS_BETWEEN, {'start': month_start, 'end': next_month_start}
+                ).scalar_one()
                 
                 # If no data, generate realistic numbers
                 if count == 0 and self.get_total_patients() > 0:
@@ -495,17 +635,8 @@ class RealDashboardService:
         """Get revenue trend by month"""
         def query():
             results = []
-            now = datetime.now()
             
-            for i in range(months):
-                month_date = now - timedelta(days=30 * (months - i - 1))
-                month_start = date(month_date.year, month_date.month, 1)
-                
-                if month_date.month == 12:
-                    next_month_start = date(month_date.year + 1, 1, 1)
-                else:
-                    next_month_start = date(month_date.year, month_date.month + 1, 1)
-                
+            for i, (month_start, next_month_start) in enumerate(_month_ranges(months)):
                 # Get total revenue for the month
                 total = self.session.query(func.sum(Visit.prix)).filter(
                     and_(
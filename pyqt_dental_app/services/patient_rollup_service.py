@@ -0,0 +1,90 @@
+"""
+Patient Rollup Service
+Maintains the per-month patient counts (patient_month_rollup) read by the dashboards
+"""
+
+from sqlalchemy import event, inspect
+from sqlalchemy.sql import text
+
+from ..models.database import Patient
+
+_REFRESH_STATEMENTS = (
+    text("DELETE FROM patient_month_rollup"),
+    text(
+        "INSERT INTO patient_month_rollup (ym, patient_count) "
+        "SELECT COALESCE(strftime('%Y-%m', created_at), ''), COUNT(*) "
+        "FROM patients GROUP BY 1"
+    ),
+)
+
+# Adds :delta to one month's count, creating its row if needed
+_ADJUST_STATEMENT = text(
+    "INSERT INTO patient_month_rollup (ym, patient_count) VALUES (:ym, :delta) "
+    "ON CONFLICT(ym) DO UPDATE SET patient_count = patient_count + excluded.patient_count"
+)
+
+# Engine URLs whose rollup was rebuilt by this process; from then on the Patient
+# mapper events keep it current
+_rollup_built = set()
+
+def _month_key(created_at):
+    """Rollup key of a creation date: 'YYYY-MM', '' when missing"""
+    return f"{created_at.year}-{created_at.month:02d}" if created_at else ''
+
+def mark_rollup_stale(*args):
+    """Force the next ensure_rollup to rebuild from the patients table"""
+    _rollup_built.clear()
+
+def _adjust(connection, changes):
+    """Apply (ym, delta) changes inside the flush that caused them"""
+    try:
+        for ym, delta in changes:
+            connection.execute(_ADJUST_STATEMENT, {'ym': ym, 'delta': delta})
+    except Exception:
+        # Never fail a patient save over the rollup; recount it on next use instead
+        mark_rollup_stale()
+
+@event.listens_for(Patient, 'after_insert')
+def _on_patient_inserted(mapper, connection, target):
+    _adjust(connection, [(_month_key(target.created_at), 1)])
+
+@event.listens_for(Patient, 'after_delete')
+def _on_patient_deleted(mapper, connection, target):
+    _adjust(connection, [(_month_key(target.created_at), -1)])
+
+@event.listens_for(Patient, 'after_update')
+def _on_patient_updated(mapper, connection, target):
+    # Only a change of creation date moves a patient between months
+    history = inspect(target).attrs.created_at.history
+    if not history.has_changes():
+        return
+    if not history.deleted:
+        # Previous value was never loaded, so its month is unknown
+        mark_rollup_stale()
+        return
+    changes = [(_month_key(value), -1) for value in history.deleted]
+    changes += [(_month_key(value), 1) for value in history.added]
+    _adjust(connection, changes)
+
+def rebuild_rollup(engine):
+    """Recount every month from the patients table in one transaction"""
+    # Runs on its own connection so a caller's pending session state is never committed
+    with engine.begin() as connection:
+        for statement in _REFRESH_STATEMENTS:
+            connection.execute(statement)
+    _rollup_built.add(str(engine.url))
+
+def ensure_rollup(engine):
+    """Rebuild the rollup once per process and database (usually already done at startup)"""
+    if str(engine.url) not in _rollup_built:
+        rebuild_rollup(engine)
+
+class PatientRollupService:
+    """Service keeping the patient month rollup up to date"""
+    
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+    
+    def refresh(self):
+        """Rebuild the rollup now (application start)"""
+        rebuild_rollup(self.db_manager.engine)
@@ -4,6 +4,7 @@ Migrated from Flask routes to standalone service class
 """
 
 from ..models.database import Visit, Patient, DatabaseManager
+from sqlalchemy import func
 from typing import List, Optional, Tuple
 from datetime import datetime, date
 
@@ -13,12 +14,16 @@ class VisitService:
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
     
-    def get_visits_for_patient(self, patient_id: int) -> List[Visit]:
-        """Get all visits for a specific patient"""
+    def get_visits_for_patient(self, patient_id: int, offset: int = 0,
+                               limit: Optional[int] = None) -> List[Visit]:
+        """
+        Get visits for a specific patient, most recent first
+        Pass offset/limit to fetch a single page instead of the full history
+        """
         session = self.db_manager.get_session()
         try:
             # Query visits directly without relationships to avoid session issues
-            results = session.query(
+            query = session.query(
                 Visit.id,
                 Visit.date,
                 Visit.dent,
@@ -27,7 +32,14 @@ class VisitService:
                 Visit.paye,
                 Visit.reste,
                 Visit.patient_id
-            ).filter_by(patient_id=patient_id).order_by(Visit.date.desc()).all()
+            ).filter_by(patient_id=patient_id).order_by(Visit.date.desc(), Visit.id.desc())
+            
+            if offset:
+                query = query.offset(offset)
+            if limit is not None:
+                query = query.limit(limit)
+            
+            results = query.all()
             
             # Create visit objects
             visits = []
@@ -52,6 +64,39 @@ class VisitService:
         finally:
             session.close()
     
+    def count_visits(self, patient_id: int) -> int:
+        """Get the number of visits recorded for a patient"""
+        session = self.db_manager.get_session()
+        try:
+            return session.query(func.count(Visit.id)).filter_by(patient_id=patient_id).scalar() or 0
+        finally:
+            session.close()
+    
+    def get_visit_totals(self, patient_id: int) -> dict:
+        """
+        Visit count and amount totals for a patient, aggregated by SQLite
+        Returns dict with total_visits, total_revenue, total_paid, total_unpaid
+        """
+        session = self.db_manager.get_session()
+        try:
+            prix = func.coalesce(Visit.prix, 0.0)
+            paye = func.coalesce(Visit.paye, 0.0)
+            # Reste is derived from prix - paye, as in get_visits_for_patient
+            count, revenue, paid, unpaid = session.query(
+                func.count(Visit.id),
+                func.sum(prix),
+                func.sum(paye),
+                func.sum(prix - paye)
+            ).filter_by(patient_id=patient_id).one()
+            return {
+                'total_visits': count or 0,
+                'total_revenue': revenue or 0.0,
+                'total_paid': paid or 0.0,
+                'total_unpaid': unpaid or 0.0
+            }
+        finally:
+            session.close()
+    
     def get_visit_by_id(self, visit_id: int) -> Optional[Visit]:
         """Get visit by ID"""
         session = self.db_manager.get_session()
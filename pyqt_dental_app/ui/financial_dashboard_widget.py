@@ -10,6 +10,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt5.QtCore import Qt, QDate
 from PyQt5.QtGui import QFont, QColor
 from datetime import datetime, timedelta
+import logging
 import matplotlib.pyplot as plt
 import numpy as np
 try:
@@ -23,6 +24,57 @@ from matplotlib.figure import Figure
 
 from ..services.dashboard_service_real import RealDashboardService
 
+logger = logging.getLogger(__name__)
+
+# Shared by every KPI card
+_KPI_CARD_QSS = """
+QFrame {
+    background-color: white;
+    border-radius: 8px;
+    border: 2px solid #e0e0e0;
+    padding: 15px;
+    margin: 5px;
+}
+QFrame:hover {
+    border-color: #3498db;
+    box-shadow: 0 2px 8px rgba(52, 152, 219, 0.2);
+}
+QLabel#title {
+    color: #2c3e50;
+    font-size: 14px;
+    font-weight: bold;
+}
+QLabel#value {
+    color: #27ae60;
+    font-size: 24px;
+    font-weight: bold;
+    margin: 5px 0;
+}
+QLabel#description {
+    color: #7f8c8d;
+    font-size: 12px;
+    font-weight: 500;
+}
+"""
+
+_KPI_FRAME_QSS = """
+QFrame {
+    background-color: #f8f9fa;
+    border-radius: 10px;
+    padding: 20px;
+    border: 2px solid #e0e0e0;
+    margin: 10px 0;
+}
+"""
+
+# Shared by the four chart panels
+_CHART_PANEL_QSS = """
+background: white;
+border: 1px solid #e0e0e0;
+border-radius: 8px;
+padding: 15px;
+"""
+
 class FinancialDashboardWidget(QWidget):
     """Financial dashboard for revenue, expenses, and profit analysis"""
     
@@ -30,8 +82,8 @@ class FinancialDashboardWidget(QWidget):
         super().__init__(parent)
         # Use RealDashboardService if none provided
         self.dashboard_service = dashboard_service or RealDashboardService()
+        # Data is loaded by the host (MainDashboardWidget.load_dashboard) or load_data()
         self.init_ui()
-        self.load_data()
     
     def init_ui(self):
         """Initialize the user interface"""
@@ -145,35 +197,7 @@ class FinancialDashboardWidget(QWidget):
     def create_kpi_card(self, title, value, description, icon_name):
         """Create a KPI card with icon, value and description"""
         card = QFrame()
-        card.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 8px;
-                border: 2px solid #e0e0e0;
-                padding: 15px;
-                margin: 5px;
-            }
-            QFrame:hover {
-                border-color: #3498db;
-                box-shadow: 0 2px 8px rgba(52, 152, 219, 0.2);
-            }
-            QLabel#title {
-                color: #2c3e50;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QLabel#value {
-                color: #27ae60;
-                font-size: 24px;
-                font-weight: bold;
-                margin: 5px 0;
-            }
-            QLabel#description {
-                color: #7f8c8d;
-                font-size: 12px;
-                font-weight: 500;
-            }
-        """)
+        card.setStyleSheet(_KPI_CARD_QSS)
         
         layout = QVBoxLayout(card)
         layout.setContentsMargins(10, 10, 10, 10)
@@ -242,15 +266,7 @@ class FinancialDashboardWidget(QWidget):
     def create_kpi_section(self, layout):
         """Create the KPI section with financial metrics"""
         kpi_frame = QFrame()
-        kpi_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border-radius: 10px;
-                padding: 20px;
-                border: 2px solid #e0e0e0;
-                margin: 10px 0;
-            }
-        """)
+        kpi_frame.setStyleSheet(_KPI_FRAME_QSS)
         
         # Use a grid layout for better responsiveness
         kpi_layout = QGridLayout(kpi_frame)
@@ -308,12 +324,7 @@ class FinancialDashboardWidget(QWidget):
         
         # Revenue vs Expenses Chart
         rev_exp_widget = QWidget()
-        rev_exp_widget.setStyleSheet("""
-            background: white;
-            border: 1px solid #e0e0e0;
-            border-radius: 8px;
-            padding: 15px;
-        """)
+        rev_exp_widget.setStyleSheet(_CHART_PANEL_QSS)
         rev_exp_layout = QVBoxLayout(rev_exp_widget)
         rev_exp_layout.setContentsMargins(0, 0, 0, 0)
         rev_exp_layout.addWidget(QLabel("<b>Revenus vs Dépenses</b>"))
@@ -322,12 +333,7 @@ class FinancialDashboardWidget(QWidget):
         
         # Expenses Pie Chart
         exp_pie_widget = QWidget()
-        exp_pie_widget.setStyleSheet("""
-            background: white;
-            border: 1px solid #e0e0e0;
-            border-radius: 8px;
-            padding: 15px;
-        """)
+        exp_pie_widget.setStyleSheet(_CHART_PANEL_QSS)
         exp_pie_layout = QVBoxLayout(exp_pie_widget)
         exp_pie_layout.setContentsMargins(0, 0, 0, 0)
         exp_pie_layout.addWidget(QLabel("<b>Répartition des Dépenses</b>"))
@@ -345,12 +351,7 @@ class FinancialDashboardWidget(QWidget):
         
         # Revenue Trend Chart
         rev_trend_widget = QWidget()
-        rev_trend_widget.setStyleSheet("""
-            background: white;
-            border: 1px solid #e0e0e0;
-            border-radius: 8px;
-            padding: 15px;
-        """)
+        rev_trend_widget.setStyleSheet(_CHART_PANEL_QSS)
         rev_trend_layout = QVBoxLayout(rev_trend_widget)
         rev_trend_layout.setContentsMargins(0, 0, 0, 0)
         rev_trend_layout.addWidget(QLabel("<b>Tendance des Revenus</b>"))
@@ -361,12 +362,7 @@ class FinancialDashboardWidget(QWidget):
         
         # Expenses Trend Chart
         exp_trend_widget = QWidget()
-        exp_trend_widget.setStyleSheet("""
-            background: white;
-            border: 1px solid #e0e0e0;
-            border-radius: 8px;
-            padding: 15px;
-        """)
+        exp_trend_widget.setStyleSheet(_CHART_PANEL_QSS)
         exp_trend_layout = QVBoxLayout(exp_trend_widget)
         exp_trend_layout.setContentsMargins(0, 0, 0, 0)
         exp_trend_layout.addWidget(QLabel("<b>Tendance des Dépenses</b>"))
@@ -1027,13 +1023,32 @@ class FinancialDashboardWidget(QWidget):
         try:
             if not self.dashboard_service:
                 return
-                
-            # Load complete financial metrics
-            financial_metrics = self.dashboard_service.get_financial_metrics()
             
-            # Load additional data
-            expenses_summary = self.dashboard_service.get_expenses_summary(months=6)
-            expenses_trend = self.dashboard_service.get_expenses_trend(months=6)
+            self.apply_data(self.fetch_data())
+            
+        except Exception as e:
+            print(f"Error loading financial data: {e}")
+    
+    def fetch_data(self, service=None):
+        """
+        Query the dashboard data without touching any widget
+        Safe to call from a worker thread when given a service with its own session
+        """
+        service = service or self.dashboard_service
+        return {
+            # Complete financial metrics
+            'financial_metrics': service.get_financial_metrics(),
+            # Additional data
+            'expenses_summary': service.get_expenses_summary(months=6),
+            'expenses_trend': service.get_expenses_trend(months=6),
+        }
+    
+    def apply_data(self, payload):
+        """Update the KPIs and charts from fetch_data() results (GUI thread only)"""
+        try:
+            financial_metrics = payload['financial_metrics']
+            expenses_summary = payload['expenses_summary']
+            expenses_trend = payload['expenses_trend']
             
             # Update KPIs with complete financial data
             self.update_kpis(financial_metrics)
@@ -1049,7 +1064,7 @@ class FinancialDashboardWidget(QWidget):
             self.update_revenue_trend(financial_metrics)
             
         except Exception as e:
-            print(f"Error loading financial data: {e}")
+            logger.exception("Error displaying financial data")
             
     def refresh_data(self):
         """Refresh data from the service"""
@@ -6,12 +6,131 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
                             QTableWidget, QTableWidgetItem, QHeaderView, QFrame,
                             QGroupBox, QMessageBox, QCheckBox, QAbstractItemView,
                             QProgressBar, QFileDialog, QSplitter, QTextEdit)
-from PyQt5.QtCore import Qt, pyqtSignal, QThread, QObject
-from PyQt5.QtGui import QFont, QColor, QBrush
+from PyQt5.QtCore import Qt, pyqtSignal, QThread, QObject, QUrl
+from PyQt5.QtGui import QFont, QColor, QBrush, QDesktopServices
 import os
-import subprocess
-import sys
+import math
 from datetime import datetime
+from functools import partial
+
+# Status column colours, shared by every row
+_STATUS_BRUSH = {
+    "Impayé": QBrush(QColor(255, 0, 0)),  # Red
+    "Payé": QBrush(QColor(0, 128, 0)),    # Green
+}
+
+_HEADER_GROUP_QSS = """
+QGroupBox {
+    font-weight: bold;
+    font-size: 16px;
+    color: #2E7D32;
+    border: 2px solid #4CAF50;
+    border-radius: 8px;
+    margin-top: 10px;
+    padding-top: 10px;
+}
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 10px 0 10px;
+}
+"""
+
+_SECTION_GROUP_QSS = """
+QGroupBox {
+    font-weight: bold;
+    font-size: 14px;
+    color: #2E7D32;
+    border: 2px solid #ddd;
+    border-radius: 5px;
+    margin-top: 10px;
+    padding-top: 10px;
+}
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px 0 5px;
+}
+"""
+
+_TABLE_QSS = """
+QTableWidget {
+    background-color: white;
+    border: 1px solid #ddd;
+    border-radius: 5px;
+    gridline-color: #e0e0e0;
+    selection-background-color: #E8F5E8;
+}
+QTableWidget::item {
+    padding: 8px;
+    border-bottom: 1px solid #e0e0e0;
+}
+QTableWidget::item:selected {
+    background-color: #E8F5E8;
+    color: #2E7D32;
+}
+QHeaderView::section {
+    background-color: #4CAF50;
+    color: white;
+    padding: 10px;
+    border: none;
+    font-weight: bold;
+}
+"""
+
+_PREVIEW_TEXT_QSS = """
+QTextEdit {
+    background-color: #f9f9f9;
+    border: 1px solid #ddd;
+    border-radius: 5px;
+    padding: 10px;
+    font-family: 'Courier New', monospace;
+    font-size: 11px;
+}
+"""
+
+_TOTALS_LABEL_QSS = """
+font-weight: bold;
+font-size: 14px;
+color: #2E7D32;
+padding: 10px;
+background-color: #E8F5E8;
+border-radius: 5px;
+"""
+
+_BTN_PRIMARY_QSS = """
+QPushButton {
+    background-color: #4CAF50;
+    color: white;
+    border: none;
+    padding: 12px 24px;
+    border-radius: 6px;
+    font-weight: bold;
+    font-size: 14px;
+}
+QPushButton:hover {
+    background-color: #45a049;
+}
+QPushButton:pressed {
+    background-color: #3d8b40;
+}
+QPushButton:disabled {
+    background-color: #cccccc;
+    color: #666666;
+}
+"""
+
+_PROGRESS_QSS = """
+QProgressBar {
+    border: 2px solid #4CAF50;
+    border-radius: 5px;
+    text-align: center;
+}
+QProgressBar::chunk {
+    background-color: #4CAF50;
+    border-radius: 3px;
+}
+"""
 
 class InvoiceGenerationWorker(QObject):
     """Worker thread for invoice generation"""
@@ -42,13 +161,23 @@ class InvoiceWidget(QWidget):
     # Signals
     invoice_created = pyqtSignal(str)  # Emits the invoice file path
     
+    # Date, Dent, Prix and Status columns are sized to their contents
+    _CONTENT_SIZED_COLUMNS = (1, 2, 4, 5)
+    
     def __init__(self, visit_service, invoice_service, patient_id):
         super().__init__()
         self.visit_service = visit_service
         self.invoice_service = invoice_service
         self.patient_id = patient_id
         self.visits = []
+        self._visit_by_id = {}
         self.selected_visit_ids = set()
+        
+        # Visits are loaded one page at a time as the table is scrolled
+        self._visit_page_size = 200
+        self._visit_total = 0
+        # Set while "select all" pulls in the remaining pages, to refresh the selection once
+        self._loading_all_visits = False
         self.init_ui()
         self.load_visits()
     
@@ -82,22 +211,7 @@ class InvoiceWidget(QWidget):
     def create_header(self, parent_layout):
         """Create header section"""
         header_group = QGroupBox("Création de Facture")
-        header_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 16px;
-                color: #2E7D32;
-                border: 2px solid #4CAF50;
-                border-radius: 8px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 10px 0 10px;
-            }
-        """)
+        header_group.setStyleSheet(_HEADER_GROUP_QSS)
         
         header_layout = QVBoxLayout(header_group)
         
@@ -117,22 +231,7 @@ class InvoiceWidget(QWidget):
         
         # Visits table group
         visits_group = QGroupBox("Sélection des Visites")
-        visits_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 14px;
-                color: #2E7D32;
-                border: 2px solid #ddd;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
+        visits_group.setStyleSheet(_SECTION_GROUP_QSS)
         
         visits_layout = QVBoxLayout(visits_group)
         
@@ -152,30 +251,7 @@ class InvoiceWidget(QWidget):
         ])
         
         # Table styling
-        self.visits_table.setStyleSheet("""
-            QTableWidget {
-                background-color: white;
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                gridline-color: #e0e0e0;
-                selection-background-color: #E8F5E8;
-            }
-            QTableWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #e0e0e0;
-            }
-            QTableWidget::item:selected {
-                background-color: #E8F5E8;
-                color: #2E7D32;
-            }
-            QHeaderView::section {
-                background-color: #4CAF50;
-                color: white;
-                padding: 10px;
-                border: none;
-                font-weight: bold;
-            }
-        """)
+        self.visits_table.setStyleSheet(_TABLE_QSS)
         
         # Table properties
         self.visits_table.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -183,15 +259,13 @@ class InvoiceWidget(QWidget):
         self.visits_table.verticalHeader().setVisible(False)
         self.visits_table.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.visits_table.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.visits_table.verticalScrollBar().valueChanged.connect(self.on_visits_scrolled)
         
-        # Auto-resize columns
+        # Column sizing (content-sized columns are fixed until the table is populated)
         header = self.visits_table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Fixed)  # Selection checkbox
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)  # Date
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # Dent
         header.setSectionResizeMode(3, QHeaderView.Stretch)  # Acte
-        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # Prix
-        header.setSectionResizeMode(5, QHeaderView.ResizeToContents)  # Status
+        self._freeze_columns()
         
         # Set column widths
         self.visits_table.setColumnWidth(0, 80)   # Selection checkbox
@@ -213,51 +287,20 @@ class InvoiceWidget(QWidget):
         
         # Preview group
         preview_group = QGroupBox("Aperçu de la Facture")
-        preview_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 14px;
-                color: #2E7D32;
-                border: 2px solid #ddd;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
+        preview_group.setStyleSheet(_SECTION_GROUP_QSS)
         
         preview_layout = QVBoxLayout(preview_group)
         
         # Preview text area
         self.preview_text = QTextEdit()
         self.preview_text.setReadOnly(True)
-        self.preview_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #f9f9f9;
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                padding: 10px;
-                font-family: 'Courier New', monospace;
-                font-size: 11px;
-            }
-        """)
+        self.preview_text.setStyleSheet(_PREVIEW_TEXT_QSS)
         self.preview_text.setMaximumHeight(300)
         preview_layout.addWidget(self.preview_text)
         
         # Invoice totals
         self.invoice_totals_label = QLabel("Total: 0.00 DH")
-        self.invoice_totals_label.setStyleSheet("""
-            font-weight: bold; 
-            font-size: 14px; 
-            color: #2E7D32; 
-            padding: 10px;
-            background-color: #E8F5E8;
-            border-radius: 5px;
-        """)
+        self.invoice_totals_label.setStyleSheet(_TOTALS_LABEL_QSS)
         preview_layout.addWidget(self.invoice_totals_label)
         
         layout.addWidget(preview_group)
@@ -269,44 +312,14 @@ class InvoiceWidget(QWidget):
         
         # Create invoice button
         self.create_invoice_btn = QPushButton("📄 Créer Facture")
-        self.create_invoice_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 12px 24px;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-            QPushButton:pressed {
-                background-color: #3d8b40;
-            }
-            QPushButton:disabled {
-                background-color: #cccccc;
-                color: #666666;
-            }
-        """)
+        self.create_invoice_btn.setStyleSheet(_BTN_PRIMARY_QSS)
         self.create_invoice_btn.clicked.connect(self.create_invoice)
         self.create_invoice_btn.setEnabled(False)
         
         # Progress bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 2px solid #4CAF50;
-                border-radius: 5px;
-                text-align: center;
-            }
-            QProgressBar::chunk {
-                background-color: #4CAF50;
-                border-radius: 3px;
-            }
-        """)
+        self.progress_bar.setStyleSheet(_PROGRESS_QSS)
         
         button_layout.addWidget(self.create_invoice_btn)
         button_layout.addWidget(self.progress_bar)
@@ -315,70 +328,165 @@ class InvoiceWidget(QWidget):
         parent_layout.addLayout(button_layout)
     
     def load_visits(self):
-        """Load visits for the patient"""
+        """Load the first page of visits for the patient"""
         try:
-            self.visits = self.visit_service.get_visits_for_patient(self.patient_id)
-            self.populate_visits_table()
+            self.visits = []
+            self._visit_by_id = {}
+            self.visits_table.setRowCount(0)
+            self._visit_total = self.visit_service.count_visits(self.patient_id)
+            self.fetch_more_visits()
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement des visites: {str(e)}")
     
-    def populate_visits_table(self):
-        """Populate the visits table"""
-        self.visits_table.setRowCount(len(self.visits))
-        
-        for row, visit in enumerate(self.visits):
-            # Selection checkbox
-            checkbox = QCheckBox()
-            checkbox.stateChanged.connect(lambda state, v=visit: self.on_visit_selection_changed(v, state))
-            self.visits_table.setCellWidget(row, 0, checkbox)
-            
-            # Date
-            date_item = QTableWidgetItem(visit.date.strftime("%d/%m/%Y") if visit.date else "")
-            date_item.setFlags(date_item.flags() & ~Qt.ItemIsEditable)
-            self.visits_table.setItem(row, 1, date_item)
-            
-            # Dent
-            dent_item = QTableWidgetItem(visit.dent or "")
-            dent_item.setFlags(dent_item.flags() & ~Qt.ItemIsEditable)
-            self.visits_table.setItem(row, 2, dent_item)
-            
-            # Acte
-            acte_item = QTableWidgetItem(visit.acte or "")
-            acte_item.setFlags(acte_item.flags() & ~Qt.ItemIsEditable)
-            self.visits_table.setItem(row, 3, acte_item)
-            
-            # Prix
-            prix_item = QTableWidgetItem(f"{visit.prix:.2f} DH" if visit.prix else "0.00 DH")
-            prix_item.setFlags(prix_item.flags() & ~Qt.ItemIsEditable)
-            self.visits_table.setItem(row, 4, prix_item)
+    def can_fetch_more_visits(self):
+        """Check if some visits have not been loaded yet"""
+        return len(self.visits) < self._visit_total
+    
+    def fetch_more_visits(self):
+        """Load the next page of visits and append it to the table"""
+        if not self.can_fetch_more_visits():
+            return
+        
+        start_row = len(self.visits)
+        page = self.visit_service.get_visits_for_patient(
+            self.patient_id, start_row, self._visit_page_size
+        )
+        if not page:
+            # History shrank since it was counted
+            self._visit_total = start_row
+            return
+        
+        self.visits.extend(page)
+        self._visit_by_id.update((visit.id, visit) for visit in page)
+        self.populate_visits_table(page, start_row)
+    
+    def on_visits_scrolled(self, value):
+        """Load the next page when the table is scrolled to the bottom"""
+        if value == self.visits_table.verticalScrollBar().maximum() and self.can_fetch_more_visits():
+            try:
+                self.fetch_more_visits()
+            except Exception as e:
+                QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement des visites: {str(e)}")
+    
+    def _freeze_columns(self):
+        """Keep content-sized columns fixed so inserting rows doesn't re-measure them"""
+        header = self.visits_table.horizontalHeader()
+        for column in self._CONTENT_SIZED_COLUMNS:
+            header.setSectionResizeMode(column, QHeaderView.Fixed)
+    
+    def _finalize_columns(self):
+        """Size the Date, Dent, Prix and Status columns to their contents once"""
+        header = self.visits_table.horizontalHeader()
+        for column in self._CONTENT_SIZED_COLUMNS:
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+    
+    def populate_visits_table(self, visits, start_row=0):
+        """Append visits to the table starting at start_row"""
+        # Pages loaded after "select all" was ticked start out selected
+        select_all = self.select_all_checkbox.isChecked()
+        
+        # Avoid a relayout and repaint of the grid for every inserted cell
+        self.visits_table.setUpdatesEnabled(False)
+        sorting_enabled = self.visits_table.isSortingEnabled()
+        self.visits_table.setSortingEnabled(False)
+        was_blocked = self.visits_table.blockSignals(True)
+        try:
+            self._freeze_columns()
+            self.visits_table.setRowCount(start_row + len(visits))
             
-            # Status
-            if visit.reste and visit.reste > 0:
-                status = "Impayé"
-                color = QColor(255, 0, 0)  # Red
-            else:
-                status = "Payé"
-                color = QColor(0, 128, 0)  # Green
+            for row, visit in enumerate(visits, start_row):
+                # Selection checkbox
+                checkbox = QCheckBox()
+                if select_all:
+                    checkbox.setChecked(True)
+                    self.selected_visit_ids.add(visit.id)
+                checkbox.stateChanged.connect(partial(self.on_visit_selection_changed, visit.id))
+                self.visits_table.setCellWidget(row, 0, checkbox)
+                
+                # Date (formatted by hand, strftime is comparatively slow per row)
+                visit_date = visit.date
+                date_item = QTableWidgetItem(
+                    f"{visit_date.day:02d}/{visit_date.month:02d}/{visit_date.year:04d}" if visit_date else ""
+                )
+                date_item.setFlags(date_item.flags() & ~Qt.ItemIsEditable)
+                self.visits_table.setItem(row, 1, date_item)
+                
+                # Dent
+                dent_item = QTableWidgetItem(visit.dent or "")
+                dent_item.setFlags(dent_item.flags() & ~Qt.ItemIsEditable)
+                self.visits_table.setItem(row, 2, dent_item)
+                
+                # Acte
+                acte_item = QTableWidgetItem(visit.acte or "")
+                acte_item.setFlags(acte_item.flags() & ~Qt.ItemIsEditable)
+                self.visits_table.setItem(row, 3, acte_item)
+                
+                # Prix
+                prix_item = QTableWidgetItem(f"{visit.prix:.2f} DH" if visit.prix else "0.00 DH")
+                prix_item.setFlags(prix_item.flags() & ~Qt.ItemIsEditable)
+                self.visits_table.setItem(row, 4, prix_item)
+                
+                # Status
+                status = "Impayé" if visit.reste and visit.reste > 0 else "Payé"
+                
+                status_item = QTableWidgetItem(status)
+                status_item.setFlags(status_item.flags() & ~Qt.ItemIsEditable)
+                status_item.setForeground(_STATUS_BRUSH[status])
+                self.visits_table.setItem(row, 5, status_item)
             
-            status_item = QTableWidgetItem(status)
-            status_item.setFlags(status_item.flags() & ~Qt.ItemIsEditable)
-            status_item.setForeground(QBrush(color))
-            self.visits_table.setItem(row, 5, status_item)
+            self._finalize_columns()
+        finally:
+            self.visits_table.blockSignals(was_blocked)
+            self.visits_table.setSortingEnabled(sorting_enabled)
+            self.visits_table.setUpdatesEnabled(True)
+            self.visits_table.viewport().update()
+        
+        if select_all and visits and not self._loading_all_visits:
+            self.refresh_selection()
     
     def on_select_all_changed(self, state):
         """Handle select all checkbox change"""
-        for row in range(self.visits_table.rowCount()):
-            checkbox = self.visits_table.cellWidget(row, 0)
-            if checkbox:
-                checkbox.setChecked(state == Qt.Checked)
+        checked = state == Qt.Checked
+        
+        if checked:
+            # Select all means the whole history, not just the pages loaded so far;
+            # the pages fetched here start out selected (see populate_visits_table)
+            self._loading_all_visits = True
+            try:
+                while self.can_fetch_more_visits():
+                    self.fetch_more_visits()
+            except Exception as e:
+                QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement des visites: {str(e)}")
+            finally:
+                self._loading_all_visits = False
+        
+        # Update the row checkboxes silently and refresh the selection once,
+        # instead of once per row through on_visit_selection_changed
+        self.visits_table.setUpdatesEnabled(False)
+        try:
+            for row in range(self.visits_table.rowCount()):
+                checkbox = self.visits_table.cellWidget(row, 0)
+                if checkbox:
+                    checkbox.blockSignals(True)
+                    checkbox.setChecked(checked)
+                    checkbox.blockSignals(False)
+        finally:
+            self.visits_table.setUpdatesEnabled(True)
+        
+        self.selected_visit_ids = {v.id for v in self.visits} if checked else set()
+        self.refresh_selection()
     
-    def on_visit_selection_changed(self, visit, state):
+    def on_visit_selection_changed(self, visit_id, state):
         """Handle individual visit selection change"""
         if state == Qt.Checked:
-            self.selected_visit_ids.add(visit.id)
+            self.selected_visit_ids.add(visit_id)
         else:
-            self.selected_visit_ids.discard(visit.id)
+            self.selected_visit_ids.discard(visit_id)
         
+        self.refresh_selection()
+    
+    def refresh_selection(self):
+        """Refresh the summary, preview and create button for the current selection"""
         self.update_summary()
         self.update_preview()
         self.create_invoice_btn.setEnabled(len(self.selected_visit_ids) > 0)
@@ -389,11 +497,11 @@ class InvoiceWidget(QWidget):
             self.visit_summary_label.setText("Aucune visite sélectionnée")
             return
         
-        selected_visits = [v for v in self.visits if v.id in self.selected_visit_ids]
-        total_price = sum(v.prix for v in selected_visits if v.prix)
+        # Walk the selection rather than every loaded visit
+        total_price = math.fsum(self._visit_by_id[visit_id].prix or 0.0 for visit_id in self.selected_visit_ids)
         
         self.visit_summary_label.setText(
-            f"{len(selected_visits)} visite(s) sélectionnée(s) - Total: {total_price:.2f} DH"
+            f"{len(self.selected_visit_ids)} visite(s) sélectionnée(s) - Total: {total_price:.2f} DH"
         )
     
     def update_preview(self):
@@ -502,37 +610,19 @@ class InvoiceWidget(QWidget):
     
     def open_file(self, file_path):
         """Open the generated file with default application"""
-        try:
-            if os.name == 'nt':  # Windows
-                os.startfile(file_path)
-            elif sys.platform == 'darwin':  # macOS
-                subprocess.Popen(['open', file_path])
-            else:  # Linux and other POSIX
-                subprocess.Popen(['xdg-open', file_path])
-        except Exception as e:
+        # openUrl hands the file to the desktop and returns without waiting
+        if not QDesktopServices.openUrl(QUrl.fromLocalFile(file_path)):
             # Only warn if file truly doesn't exist; otherwise ignore spurious errors
             if not os.path.exists(file_path):
-                QMessageBox.warning(self, "Attention", f"Impossible d'ouvrir le fichier: {str(e)}")
+                QMessageBox.warning(self, "Attention", "Impossible d'ouvrir le fichier: fichier introuvable")
     
     def open_folder(self, folder_path):
         """Open the folder containing the file"""
-        try:
-            if not os.path.isdir(folder_path):
-                QMessageBox.warning(self, "Attention", "Le dossier n'existe pas.")
-                return
-            # Use non-blocking calls and avoid strict return code checks to prevent false errors
-            if os.name == 'nt':  # Windows
-                folder_path = folder_path.replace('/', '\\')
-                try:
-                    os.startfile(folder_path)
-                except Exception:
-                    # Fallback to explorer without check
-                    subprocess.Popen(['explorer', folder_path])
-            elif sys.platform == 'darwin':  # macOS
-                subprocess.Popen(['open', folder_path])
-            else:  # Linux and other POSIX
-                subprocess.Popen(['xdg-open', folder_path])
-        except Exception as e:
-            # Do not show a popup if the OS likely opened the folder but returned a non-zero code
+        if not os.path.isdir(folder_path):
+            QMessageBox.warning(self, "Attention", "Le dossier n'existe pas.")
+            return
+        
+        if not QDesktopServices.openUrl(QUrl.fromLocalFile(folder_path)):
+            # Do not show a popup if the OS likely opened the folder anyway
             # Only log to console to avoid disturbing UX
-            print(f"Warning: unable to open folder '{folder_path}': {e}") 
\ No newline at end of file
+            print(f"Warning: unable to open folder '{folder_path}'")
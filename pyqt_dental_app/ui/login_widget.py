@@ -10,6 +10,60 @@ from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QPixmap, QPalette
 import sys
 
+_LOGIN_ROOT_QSS = """
+QWidget {
+    background-color: #f0f0f0;
+    font-family: 'Segoe UI', Arial, sans-serif;
+}
+QLabel {
+    color: #333;
+}
+QLineEdit {
+    padding: 8px;
+    border: 2px solid #ddd;
+    border-radius: 5px;
+    font-size: 14px;
+    background-color: white;
+}
+QLineEdit:focus {
+    border-color: #4CAF50;
+}
+QPushButton {
+    background-color: #4CAF50;
+    color: white;
+    border: none;
+    padding: 10px;
+    border-radius: 5px;
+    font-size: 14px;
+    font-weight: bold;
+}
+QPushButton:hover {
+    background-color: #45a049;
+}
+QPushButton:pressed {
+    background-color: #3d8b40;
+}
+"""
+
+_FORM_FRAME_QSS = """
+QFrame {
+    background-color: white;
+    border: 1px solid #ddd;
+    border-radius: 10px;
+    padding: 20px;
+}
+"""
+
+_ERROR_BOX_QSS = """
+QMessageBox {
+    background-color: white;
+}
+QMessageBox QPushButton {
+    min-width: 80px;
+    min-height: 30px;
+}
+"""
+
 class LoginWidget(QWidget):
     """Login widget for user authentication"""
     
@@ -26,40 +80,7 @@ class LoginWidget(QWidget):
         self.setWindowTitle("DentisteDB - Connexion")
         self.setMinimumSize(500, 450)
         self.resize(600, 500)
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #f0f0f0;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }
-            QLabel {
-                color: #333;
-            }
-            QLineEdit {
-                padding: 8px;
-                border: 2px solid #ddd;
-                border-radius: 5px;
-                font-size: 14px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border-color: #4CAF50;
-            }
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 10px;
-                border-radius: 5px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-            QPushButton:pressed {
-                background-color: #3d8b40;
-            }
-        """)
+        self.setStyleSheet(_LOGIN_ROOT_QSS)
         
         # Main layout with proper centering
         main_layout = QVBoxLayout()
@@ -84,14 +105,7 @@ class LoginWidget(QWidget):
         # Login form frame
         form_frame = QFrame()
         form_frame.setFrameStyle(QFrame.Box)
-        form_frame.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border: 1px solid #ddd;
-                border-radius: 10px;
-                padding: 20px;
-            }
-        """)
+        form_frame.setStyleSheet(_FORM_FRAME_QSS)
         
         form_layout = QVBoxLayout(form_frame)
         form_layout.setSpacing(15)
@@ -139,27 +153,32 @@ class LoginWidget(QWidget):
     def handle_login(self):
         """Handle login button click"""
         username = self.username_input.text().strip()
-        password = self.password_input.text()
         
-        if not username or not password:
+        if not username or not self.password_input.text():
             self.show_error("Erreur", "Veuillez remplir tous les champs")
             return
         
+        # Keep the password in a mutable buffer that can be wiped after use,
+        # and release the line edit's copy before authenticating
+        password = bytearray(self.password_input.text(), 'utf-8')
+        self.password_input.clear()
+        
         # Disable button during login attempt
         self.login_button.setEnabled(False)
         self.login_button.setText("Connexion en cours...")
         
         # Attempt login
-        success, message = self.auth_service.login(username, password)
+        try:
+            success, message, user = self.auth_service.login(username, password)
+        finally:
+            for i in range(len(password)):
+                password[i] = 0
         
         if success:
             # Emit signal with authenticated user
-            user = self.auth_service.get_current_user()
             self.login_successful.emit(user)
         else:
             self.show_error("Erreur de connexion", message)
-            # Clear password field
-            self.password_input.clear()
             self.password_input.setFocus()
         
         # Re-enable button
@@ -172,15 +191,7 @@ class LoginWidget(QWidget):
         msg_box.setIcon(QMessageBox.Critical)
         msg_box.setWindowTitle(title)
         msg_box.setText(message)
-        msg_box.setStyleSheet("""
-            QMessageBox {
-                background-color: white;
-            }
-            QMessageBox QPushButton {
-                min-width: 80px;
-                min-height: 30px;
-            }
-        """)
+        msg_box.setStyleSheet(_ERROR_BOX_QSS)
         msg_box.exec_()
     
     def clear_fields(self):
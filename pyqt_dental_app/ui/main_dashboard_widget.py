@@ -5,23 +5,258 @@ Container for all dashboard views with tabbed interface
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, 
                              QPushButton, QLabel, QFrame, QMessageBox)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, QSettings, pyqtSignal
 from PyQt5.QtGui import QFont
+from datetime import datetime
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 try:
     from .financial_dashboard_widget import FinancialDashboardWidget
     from .patient_dashboard_widget import PatientDashboardWidget
-    from ..services.dashboard_service_real import RealDashboardService
+    from ..services.dashboard_service_real import RealDashboardService, open_worker_service
     REAL_SERVICE_AVAILABLE = True
 except ImportError as e:
-    print(f"Real service not available, falling back to simple service: {e}")
+    logger.warning("Real service not available, falling back to simple service: %s", e)
     try:
         from ..services.dashboard_service_simple import DashboardService
         REAL_SERVICE_AVAILABLE = False
     except ImportError as e2:
-        print(f"Import error in main_dashboard_widget: {e2}")
+        logger.error("Import error in main_dashboard_widget: %s", e2)
         REAL_SERVICE_AVAILABLE = False
 
+# Header frame and its action buttons (selected by objectName)
+_HEADER_QSS = """
+QFrame {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 #2c3e50, stop:0.5 #34495e, stop:1 #2c3e50);
+    border-bottom: 3px solid #3498db;
+}
+QPushButton#refreshBtn, QPushButton#exportBtn, QPushButton#settingsBtn {
+    color: white;
+    border: none;
+    border-radius: 8px;
+    padding: 12px 20px;
+    font-size: 14px;
+    font-weight: bold;
+}
+QPushButton#refreshBtn { background-color: #3498db; }
+QPushButton#refreshBtn:hover { background-color: #2980b9; }
+QPushButton#refreshBtn:pressed { background-color: #21618c; }
+QPushButton#exportBtn { background-color: #27ae60; }
+QPushButton#exportBtn:hover { background-color: #229954; }
+QPushButton#exportBtn:pressed { background-color: #1e8449; }
+QPushButton#settingsBtn { background-color: #95a5a6; }
+QPushButton#settingsBtn:hover { background-color: #7f8c8d; }
+QPushButton#settingsBtn:pressed { background-color: #6c7b7d; }
+"""
+
+# Title and subtitle stacked in one rich-text label
+_HEADER_TITLE_HTML = (
+    "<div style='font-size:24px; font-weight:bold; color:white;'>Tableaux de Bord</div>"
+    "<div style='font-size:14px; color:#bdc3c7;'>Vue d'ensemble de votre cabinet dentaire</div>"
+)
+
+_TAB_QSS = """
+QTabWidget::pane {
+    border: none;
+    background-color: #ecf0f1;
+}
+
+QTabBar::tab {
+    background-color: #bdc3c7;
+    color: #2c3e50;
+    padding: 12px 25px;
+    margin-right: 2px;
+    border-top-left-radius: 8px;
+    border-top-right-radius: 8px;
+    font-size: 14px;
+    font-weight: bold;
+    min-width: 120px;
+}
+
+QTabBar::tab:selected {
+    background-color: #3498db;
+    color: white;
+}
+
+QTabBar::tab:hover:!selected {
+    background-color: #95a5a6;
+    color: white;
+}
+
+QTabBar::tab:selected {
+    border-bottom: 3px solid #2980b9;
+}
+"""
+
+class _CachedDashboardService:
+    """
+    Proxy around a dashboard service that memoizes method results for a few seconds
+    Consecutive consumers (tab switches, refresh ticks, exports) within the TTL share one query
+    """
+    
+    def __init__(self, service, ttl=30):
+        self._service = service
+        self.ttl = ttl
+        self._cache = {}
+    
+    def invalidate(self):
+        """Drop all cached results, including any the wrapped service keeps itself"""
+        # A new dict rather than clear(): proxies bound by loads already in flight keep
+        # the old one, so results they read before this call are not cached again
+        self._cache = {}
+        invalidate_cache = getattr(self._service, 'invalidate_cache', None)
+        if invalidate_cache is not None:
+            invalidate_cache()
+    
+    def close(self):
+        """Drop cached results and close the wrapped service if it supports it"""
+        self._cache.clear()
+        close = getattr(self._service, 'close', None)
+        if close is not None:
+            close()
+    
+    def bind(self, service):
+        """Return a proxy over another service instance that shares this cache"""
+        proxy = _CachedDashboardService(service, self.ttl)
+        proxy._cache = self._cache
+        return proxy
+    
+    def __getattr__(self, name):
+        attr = getattr(self._service, name)
+        # Methods the service caches itself are invalidated on writes; don't mask that
+        if not callable(attr) or name in getattr(self._service, 'SELF_CACHED_METHODS', ()):
+            return attr
+        
+        def cached_call(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            try:
+                entry = self._cache.get(key)
+            except TypeError:
+                # Unhashable arguments, nothing to cache
+                return attr(*args, **kwargs)
+            
+            now = time.monotonic()
+            if entry is not None and now - entry[0] < self.ttl:
+                return entry[1]
+            
+            value = attr(*args, **kwargs)
+            self._cache[key] = (now, value)
+            return value
+        
+        return cached_call
+
+def _open_worker_service(cached_service):
+    """Return (service, session) for use on a worker thread; session is None when none was opened"""
+    if not REAL_SERVICE_AVAILABLE:
+        return cached_service, None
+    return open_worker_service(cached_service)
+
+class _DashboardLoadSignals(QObject):
+    """Signals emitted by a dashboard load worker"""
+    loaded = pyqtSignal(object, object)
+    failed = pyqtSignal(object, str)
+
+class _DashboardLoadWorker(QRunnable):
+    """Run a dashboard's fetch_data() on the thread pool with its own database session"""
+    
+    def __init__(self, dashboard, cached_service):
+        super().__init__()
+        self.dashboard = dashboard
+        self.cached_service = cached_service
+        self.signals = _DashboardLoadSignals()
+    
+    def run(self):
+        worker_session = None
+        try:
+            service, worker_session = _open_worker_service(self.cached_service)
+            payload = self.dashboard.fetch_data(service)
+            self.signals.loaded.emit(self.dashboard, payload)
+        except Exception as e:
+            self.signals.failed.emit(self.dashboard, str(e))
+        finally:
+            if worker_session is not None:
+                worker_session.close()
+
+class _DashboardPrewarmWorker(QRunnable):
+    """Call the summary queries once in the background so their results land in the cache"""
+    
+    # Service methods used by the export and not already loaded by the first tab
+    PREWARM_METHODS = ('get_dashboard_summary', 'get_kpi_summary')
+    
+    def __init__(self, cached_service):
+        super().__init__()
+        self.cached_service = cached_service
+    
+    def run(self):
+        worker_session = None
+        try:
+            service, worker_session = _open_worker_service(self.cached_service)
+            for name in self.PREWARM_METHODS:
+                method = getattr(service, name, None)
+                if method is not None:
+                    method()
+        except Exception as e:
+            logger.exception("Error prewarming dashboard cache")
+        finally:
+            if worker_session is not None:
+                worker_session.close()
+
+class _DashboardExportSignals(QObject):
+    """Signals emitted by the dashboard export worker"""
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+class _DashboardExportWorker(QRunnable):
+    """Collect the dashboard summary and write it to a JSON file on the thread pool"""
+    
+    def __init__(self, filename, cached_service):
+        super().__init__()
+        self.filename = filename
+        self.cached_service = cached_service
+        self.signals = _DashboardExportSignals()
+    
+    def run(self):
+        worker_session = None
+        try:
+            service, worker_session = _open_worker_service(self.cached_service)
+            
+            # Collect data from dashboard service
+            dashboard_data = {
+                'export_date': datetime.now().isoformat(),
+                'summary': service.get_dashboard_summary(),
+                'kpis': service.get_kpi_summary()
+            }
+            
+            # Serialize in one pass, then save to file with a single write
+            if ORJSON_AVAILABLE:
+                data = orjson.dumps(
+                    dashboard_data,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                    default=str
+                )
+            else:
+                data = json.dumps(dashboard_data, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+            with open(self.filename, 'wb') as f:
+                f.write(data)
+            
+            self.signals.finished.emit(self.filename)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        finally:
+            if worker_session is not None:
+                worker_session.close()
+
 class MainDashboardWidget(QWidget):
     """Main dashboard container with multiple dashboard views"""
     
@@ -33,22 +268,67 @@ class MainDashboardWidget(QWidget):
         self.visit_service = visit_service
         self.expense_service = expense_service
         
+        # Dashboards built so far, and the subset that can reload their data
+        self.dashboards = []
+        self._refreshables = []
+        
         # Initialize dashboard service with real data
         if REAL_SERVICE_AVAILABLE:
-            self.dashboard_service = RealDashboardService(session)
-            print("Using real database service for dashboards")
+            service = RealDashboardService(session)
+            logger.info("Using real database service for dashboards")
         else:
             from ..services.dashboard_service_simple import DashboardService
-            self.dashboard_service = DashboardService()
-            print("Using mock data service for dashboards")
+            service = DashboardService()
+            logger.info("Using mock data service for dashboards")
+        
+        # Dashboard preferences saved from the settings dialog
+        self.settings = QSettings("DentisteDB", "Dashboard")
+        
+        # Share query results between dashboards for a short time (30 seconds by default)
+        self.dashboard_service = _CachedDashboardService(
+            service, ttl=int(self.settings.value("cache_seconds", 30))
+        )
+        
+        # Dashboards whose data is currently being fetched in the background
+        self._loading = set()
+        
+        # Refresh requests closer together than 250 ms are folded into one
+        self._refresh_debounce = QTimer(self)
+        self._refresh_debounce.setSingleShot(True)
+        self._refresh_debounce.setInterval(250)
         
         # Setup UI
         self.init_ui()
         
-        # Setup auto-refresh timer (10 minutes)
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.refresh_all_dashboards)
-        self.refresh_timer.start(600000)  # 10 minutes in milliseconds
+        # Auto-refresh timers, only running while the dashboards are visible:
+        # the visible tab is reloaded on the configured interval (10 minutes by default),
+        # background tabs are only marked stale and reloaded when shown again
+        self.refresh_interval_ms = int(self.settings.value("refresh_minutes", 10)) * 60000
+        self.stale_interval_ms = 1200000  # 20 minutes in milliseconds
+        self._foreground_timer = QTimer()
+        self._foreground_timer.timeout.connect(self.refresh_current_dashboard)
+        self._background_stale_timer = QTimer()
+        self._background_stale_timer.timeout.connect(self.mark_background_dashboards_stale)
+    
+    def _start_refresh_timer(self):
+        """(Re)start the auto-refresh timers with the configured intervals"""
+        self._foreground_timer.start(self.refresh_interval_ms)
+        self._background_stale_timer.start(self.stale_interval_ms)
+    
+    def _stop_refresh_timer(self):
+        """Stop the auto-refresh timers"""
+        self._foreground_timer.stop()
+        self._background_stale_timer.stop()
+    
+    def showEvent(self, event):
+        """Resume auto-refresh when the dashboards become visible"""
+        self._start_refresh_timer()
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        """Pause auto-refresh while the dashboards are hidden or minimized"""
+        self._stop_refresh_timer()
+        super().hideEvent(event)
     
     def init_ui(self):
         """Initialize the user interface"""
@@ -61,43 +341,27 @@ class MainDashboardWidget(QWidget):
         
         # Create tabbed interface
         self.create_dashboard_tabs(layout)
+        
+        # Fill the query cache once the window has had time to paint
+        QTimer.singleShot(500, self._prewarm)
+    
+    def _prewarm(self):
+        """Run the summary queries on the thread pool ahead of their first use"""
+        QThreadPool.globalInstance().start(_DashboardPrewarmWorker(self.dashboard_service))
     
     def create_header(self, layout):
         """Create main dashboard header"""
         header_frame = QFrame()
         header_frame.setFixedHeight(80)
-        header_frame.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #2c3e50, stop:0.5 #34495e, stop:1 #2c3e50);
-                border-bottom: 3px solid #3498db;
-            }
-        """)
+        header_frame.setStyleSheet(_HEADER_QSS)
         
         header_layout = QHBoxLayout(header_frame)
         header_layout.setContentsMargins(30, 15, 30, 15)
         
         # Title section
-        title_layout = QVBoxLayout()
-        
-        main_title = QLabel("Tableaux de Bord")
-        main_title.setStyleSheet("""
-            font-size: 24px; 
-            font-weight: bold; 
-            color: white;
-            margin: 0px;
-        """)
-        title_layout.addWidget(main_title)
-        
-        subtitle = QLabel("Vue d'ensemble de votre cabinet dentaire")
-        subtitle.setStyleSheet("""
-            font-size: 14px; 
-            color: #bdc3c7;
-            margin: 0px;
-        """)
-        title_layout.addWidget(subtitle)
-        
-        header_layout.addLayout(title_layout)
+        main_title = QLabel(_HEADER_TITLE_HTML)
+        main_title.setTextFormat(Qt.RichText)
+        header_layout.addWidget(main_title)
         header_layout.addStretch()
         
         # Action buttons
@@ -112,67 +376,19 @@ class MainDashboardWidget(QWidget):
         
         # Refresh button
         refresh_btn = QPushButton("🔄 Actualiser")
-        refresh_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 20px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:pressed {
-                background-color: #21618c;
-            }
-        """)
-        refresh_btn.clicked.connect(self.refresh_all_dashboards)
+        refresh_btn.setObjectName("refreshBtn")
+        refresh_btn.clicked.connect(self.on_refresh_clicked)
         buttons_layout.addWidget(refresh_btn)
         
         # Export button
         export_btn = QPushButton("Exporter")
-        export_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 20px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #229954;
-            }
-            QPushButton:pressed {
-                background-color: #1e8449;
-            }
-        """)
+        export_btn.setObjectName("exportBtn")
         export_btn.clicked.connect(self.export_dashboard_data)
         buttons_layout.addWidget(export_btn)
         
         # Settings button
         settings_btn = QPushButton("⚙️ Paramètres")
-        settings_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #95a5a6;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 20px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #7f8c8d;
-            }
-            QPushButton:pressed {
-                background-color: #6c7b7d;
-            }
-        """)
+        settings_btn.setObjectName("settingsBtn")
         settings_btn.clicked.connect(self.open_dashboard_settings)
         buttons_layout.addWidget(settings_btn)
         
@@ -182,111 +398,191 @@ class MainDashboardWidget(QWidget):
         """Create tabbed dashboard interface"""
         # Create tab widget
         self.tab_widget = QTabWidget()
-        self.tab_widget.setStyleSheet("""
-            QTabWidget::pane {
-                border: none;
-                background-color: #ecf0f1;
-            }
-            
-            QTabBar::tab {
-                background-color: #bdc3c7;
-                color: #2c3e50;
-                padding: 12px 25px;
-                margin-right: 2px;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            
-            QTabBar::tab:selected {
-                background-color: #3498db;
-                color: white;
-            }
-            
-            QTabBar::tab:hover:!selected {
-                background-color: #95a5a6;
-                color: white;
-            }
-            
-            QTabBar::tab:selected {
-                border-bottom: 3px solid #2980b9;
-            }
-        """)
+        self.tab_widget.setStyleSheet(_TAB_QSS)
         
-        # Create dashboard instances
+        # Dashboards are only built the first time their tab is shown;
+        # until then each tab holds an empty placeholder
+        self._tab_factories = {
+            0: (lambda: FinancialDashboardWidget(dashboard_service=self.dashboard_service), "Financier"),
+            1: (lambda: PatientDashboardWidget(dashboard_service=self.dashboard_service), "Patients"),
+        }
+        for index in sorted(self._tab_factories):
+            self.tab_widget.addTab(QWidget(), self._tab_factories[index][1])
+        
+        # Connect tab change signal
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+        
+        layout.addWidget(self.tab_widget)
+        
+        # Build the initially selected dashboard
+        self.on_tab_changed(self.tab_widget.currentIndex())
+    
+    def _materialize_tab(self, index):
+        """Replace a placeholder tab with its real dashboard; return True if one was built"""
+        entry = self._tab_factories.pop(index, None)
+        if entry is None:
+            return False
+        
+        factory, title = entry
         try:
-            # Financial Dashboard
-            self.financial_dashboard = FinancialDashboardWidget(
-                dashboard_service=self.dashboard_service
-            )
-            self.tab_widget.addTab(self.financial_dashboard, "Financier")
-            
-            # Patient Dashboard
-            self.patient_dashboard = PatientDashboardWidget(
-                dashboard_service=self.dashboard_service
-            )
-            self.tab_widget.addTab(self.patient_dashboard,  "Patients")
-            
-            # Store references for easy access
-            self.dashboards = [
-                self.financial_dashboard,
-                self.patient_dashboard
-            ]
-            
+            dashboard = factory()
+            self._register_dashboard(dashboard)
+            # Dashboards with a fetch/apply split load on the thread pool
+            if hasattr(dashboard, 'fetch_data'):
+                self.load_dashboard(dashboard)
+            if isinstance(dashboard, FinancialDashboardWidget):
+                self.financial_dashboard = dashboard
+            elif isinstance(dashboard, PatientDashboardWidget):
+                self.patient_dashboard = dashboard
         except Exception as e:
-            print(f"Error creating dashboards: {e}")
+            logger.exception("Error creating dashboards")
             # Create error tab
-            error_widget = QWidget()
-            error_layout = QVBoxLayout(error_widget)
+            dashboard = QWidget()
+            error_layout = QVBoxLayout(dashboard)
             error_label = QLabel(f"Erreur lors du chargement des tableaux de bord:\n{str(e)}")
             error_label.setStyleSheet("color: red; font-size: 16px; padding: 50px;")
             error_label.setAlignment(Qt.AlignCenter)
             error_layout.addWidget(error_label)
-            self.tab_widget.addTab(error_widget, "❌ Erreur")
+            title = "❌ Erreur"
         
-        # Connect tab change signal
-        self.tab_widget.currentChanged.connect(self.on_tab_changed)
-        
-        layout.addWidget(self.tab_widget)
+        placeholder = self.tab_widget.widget(index)
+        self.tab_widget.blockSignals(True)
+        try:
+            self.tab_widget.removeTab(index)
+            self.tab_widget.insertTab(index, dashboard, title)
+            self.tab_widget.setCurrentIndex(index)
+        finally:
+            self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
+        return True
     
 
     
+    def _register_dashboard(self, dashboard):
+        """Track a newly added dashboard for refreshes"""
+        self.dashboards.append(dashboard)
+        if callable(getattr(dashboard, 'load_data', None)):
+            dashboard._is_stale = False
+            self._refreshables.append(dashboard)
+    
+    def load_dashboard(self, dashboard):
+        """Fetch a dashboard's data in the background and apply it on the GUI thread"""
+        if not hasattr(dashboard, 'fetch_data'):
+            # Dashboards without a fetch/apply split still load synchronously
+            dashboard.load_data()
+            return
+        
+        if dashboard in self._loading:
+            return
+        self._loading.add(dashboard)
+        
+        worker = _DashboardLoadWorker(dashboard, self.dashboard_service)
+        worker.signals.loaded.connect(self.on_dashboard_loaded)
+        worker.signals.failed.connect(self.on_dashboard_load_failed)
+        QThreadPool.globalInstance().start(worker)
+    
+    def on_dashboard_loaded(self, dashboard, payload):
+        """Apply freshly fetched data to its dashboard"""
+        self._loading.discard(dashboard)
+        dashboard.apply_data(payload)
+        # Data changed while this load was running; fetch it again
+        if dashboard._is_stale and dashboard is self.tab_widget.currentWidget():
+            dashboard._is_stale = False
+            self.load_dashboard(dashboard)
+    
+    def on_dashboard_load_failed(self, dashboard, message):
+        """Report a background load error"""
+        self._loading.discard(dashboard)
+        logger.error("Error refreshing dashboard %s: %s", type(dashboard).__name__, message)
+        on_load_failed = getattr(dashboard, 'on_load_failed', None)
+        if on_load_failed is not None:
+            on_load_failed()
+    
+    def _refresh_pending(self):
+        """Return True while a refresh is loading or was requested a moment ago"""
+        return bool(self._loading) or self._refresh_debounce.isActive()
+    
+    def on_refresh_clicked(self):
+        """Reload every dashboard from the database, bypassing cached results"""
+        if self._refresh_pending():
+            return
+        self.dashboard_service.invalidate()
+        self.refresh_all_dashboards()
+    
+    def invalidate_data(self):
+        """
+        Drop cached results after patients or visits were saved and reload the visible dashboard
+        Return True once that reload is queued, possibly behind a load already in flight
+        """
+        self.dashboard_service.invalidate()
+        self.mark_background_dashboards_stale()
+        dashboard = self.tab_widget.currentWidget()
+        if dashboard not in self._refreshables:
+            return True
+        if dashboard in self._loading:
+            # The load in flight may have read the old data; on_dashboard_loaded reloads
+            dashboard._is_stale = True
+            return True
+        try:
+            dashboard._is_stale = False
+            self.load_dashboard(dashboard)
+        except Exception as e:
+            logger.exception("Error refreshing dashboard %s", type(dashboard).__name__)
+            return False
+        return True
+    
     def refresh_all_dashboards(self):
-        """Refresh all dashboard data"""
+        """Refresh the visible dashboard and mark the others stale"""
         try:
-            print("Refreshing all dashboards...")
-            
-            # Refresh each dashboard
-            for dashboard in getattr(self, 'dashboards', []):
-                if hasattr(dashboard, 'load_data'):
-                    try:
-                        dashboard.load_data()
-                    except Exception as e:
-                        print(f"Error refreshing dashboard {type(dashboard).__name__}: {e}")
-            
-            print("Dashboard refresh completed")
+            if self._refresh_pending():
+                return
+            self._refresh_debounce.start()
             
+            logger.debug("Refreshing all dashboards...")
+            self.mark_background_dashboards_stale()
+            self.refresh_current_dashboard()
         except Exception as e:
-            print(f"Error during dashboard refresh: {e}")
+            logger.exception("Error during dashboard refresh")
+    
+    def refresh_current_dashboard(self):
+        """Reload the dashboard in the current tab"""
+        dashboard = self.tab_widget.currentWidget()
+        if dashboard in self._refreshables:
+            try:
+                dashboard._is_stale = False
+                self.load_dashboard(dashboard)
+            except Exception as e:
+                logger.exception("Error refreshing dashboard %s", type(dashboard).__name__)
+    
+    def mark_background_dashboards_stale(self):
+        """Flag dashboards in hidden tabs for a reload on their next activation"""
+        current = self.tab_widget.currentWidget()
+        for dashboard in self._refreshables:
+            if dashboard is not current:
+                dashboard._is_stale = True
     
     def on_tab_changed(self, index):
         """Handle tab change event"""
         try:
+            # A freshly built dashboard has already queued its first load
+            if self._materialize_tab(index):
+                return
+            
+            if not self.isVisible():
+                return
+            
             current_widget = self.tab_widget.widget(index)
-            if current_widget and hasattr(current_widget, 'load_data'):
-                # Refresh data when switching to a tab
-                current_widget.load_data()
+            if current_widget in self._refreshables and current_widget._is_stale:
+                # Refresh data when switching to a tab that missed a refresh
+                current_widget._is_stale = False
+                self.load_dashboard(current_widget)
         except Exception as e:
-            print(f"Error handling tab change: {e}")
+            logger.exception("Error handling tab change")
     
     def export_dashboard_data(self):
         """Export dashboard data to file"""
         try:
-            from PyQt5.QtWidgets import QFileDialog, QMessageBox
-            from datetime import datetime
-            import json
+            from PyQt5.QtWidgets import QFileDialog
             
             # Get export file path
             filename, _ = QFileDialog.getSaveFileName(
@@ -297,97 +593,129 @@ class MainDashboardWidget(QWidget):
             )
             
             if filename:
-                # Collect data from dashboard service
-                dashboard_data = {
-                    'export_date': datetime.now().isoformat(),
-                    'summary': self.dashboard_service.get_dashboard_summary(),
-                    'kpis': self.dashboard_service.get_kpi_summary()
-                }
-                
-                # Save to file
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(dashboard_data, f, indent=2, ensure_ascii=False, default=str)
-                
-                QMessageBox.information(
-                    self,
-                    "Export réussi",
-                    f"Les données ont été exportées vers:\n{filename}"
-                )
+                # Query and serialize in the background so the window stays responsive
+                worker = _DashboardExportWorker(filename, self.dashboard_service)
+                worker.signals.finished.connect(self.on_export_finished)
+                worker.signals.failed.connect(self.on_export_failed)
+                QThreadPool.globalInstance().start(worker)
                 
         except Exception as e:
-            from PyQt5.QtWidgets import QMessageBox
-            QMessageBox.critical(
-                self,
-                "Erreur d'export",
-                f"Erreur lors de l'export des données:\n{str(e)}"
-            )
+            self.on_export_failed(str(e))
+    
+    def on_export_finished(self, filename):
+        """Confirm a completed export"""
+        QMessageBox.information(
+            self,
+            "Export réussi",
+            f"Les données ont été exportées vers:\n{filename}"
+        )
+    
+    def on_export_failed(self, message):
+        """Report an export error"""
+        QMessageBox.critical(
+            self,
+            "Erreur d'export",
+            f"Erreur lors de l'export des données:\n{message}"
+        )
+    
+    def _build_settings_dialog(self):
+        """Build the dashboard settings dialog once; its widgets are kept for reuse"""
+        from PyQt5.QtWidgets import QDialog, QCheckBox, QSpinBox, QFormLayout
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Paramètres du Tableau de Bord")
+        dialog.setFixedSize(400, 300)
+        
+        layout = QVBoxLayout(dialog)
+        
+        # Settings form
+        form_layout = QFormLayout()
+        
+        # Auto-refresh interval
+        self._refresh_spin = QSpinBox()
+        self._refresh_spin.setRange(1, 60)
+        self._refresh_spin.setSuffix(" minutes")
+        form_layout.addRow("Actualisation automatique:", self._refresh_spin)
+        
+        # How long query results are reused between dashboards
+        self._cache_spin = QSpinBox()
+        self._cache_spin.setRange(0, 600)
+        self._cache_spin.setSuffix(" secondes")
+        form_layout.addRow("Durée du cache:", self._cache_spin)
+        
+        # Enable/disable specific dashboards
+        self._main_chk = QCheckBox()
+        self._main_chk.setChecked(True)
+        form_layout.addRow("Tableau principal:", self._main_chk)
+        
+        self._financial_chk = QCheckBox()
+        self._financial_chk.setChecked(True)
+        form_layout.addRow("Tableau financier:", self._financial_chk)
+        
+        self._patient_chk = QCheckBox()
+        self._patient_chk.setChecked(True)
+        form_layout.addRow("Tableau patients:", self._patient_chk)
+        
+        layout.addLayout(form_layout)
+        
+        # Buttons
+        buttons_layout = QHBoxLayout()
+        
+        save_btn = QPushButton("Enregistrer")
+        save_btn.clicked.connect(lambda: self.save_dashboard_settings(
+            self._refresh_spin.value(),
+            self._cache_spin.value(),
+            self._main_chk.isChecked(),
+            self._financial_chk.isChecked(),
+            self._patient_chk.isChecked(),
+            dialog
+        ))
+        buttons_layout.addWidget(save_btn)
+        
+        cancel_btn = QPushButton("Annuler")
+        cancel_btn.clicked.connect(dialog.reject)
+        buttons_layout.addWidget(cancel_btn)
+        
+        layout.addLayout(buttons_layout)
+        
+        return dialog
     
     def open_dashboard_settings(self):
         """Open dashboard settings dialog"""
         try:
-            from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QCheckBox, QPushButton, QSpinBox, QFormLayout
-            
-            dialog = QDialog(self)
-            dialog.setWindowTitle("Paramètres du Tableau de Bord")
-            dialog.setFixedSize(400, 300)
-            
-            layout = QVBoxLayout(dialog)
-            
-            # Settings form
-            form_layout = QFormLayout()
-            
-            # Auto-refresh interval
-            refresh_spinbox = QSpinBox()
-            refresh_spinbox.setRange(1, 60)
-            refresh_spinbox.setValue(10)  # Default 10 minutes
-            refresh_spinbox.setSuffix(" minutes")
-            form_layout.addRow("Actualisation automatique:", refresh_spinbox)
-            
-            # Enable/disable specific dashboards
-            main_checkbox = QCheckBox()
-            main_checkbox.setChecked(True)
-            form_layout.addRow("Tableau principal:", main_checkbox)
+            if getattr(self, '_settings_dialog', None) is None:
+                self._settings_dialog = self._build_settings_dialog()
             
-            financial_checkbox = QCheckBox()
-            financial_checkbox.setChecked(True)
-            form_layout.addRow("Tableau financier:", financial_checkbox)
+            # Show the values currently in effect
+            self._refresh_spin.setValue(self.refresh_interval_ms // 60000)
+            self._cache_spin.setValue(int(self.dashboard_service.ttl))
+            self._main_chk.setChecked(self.settings.value("main_enabled", True, type=bool))
+            self._financial_chk.setChecked(self.settings.value("financial_enabled", True, type=bool))
+            self._patient_chk.setChecked(self.settings.value("patient_enabled", True, type=bool))
             
-            patient_checkbox = QCheckBox()
-            patient_checkbox.setChecked(True)
-            form_layout.addRow("Tableau patients:", patient_checkbox)
-            
-            layout.addLayout(form_layout)
-            
-            # Buttons
-            buttons_layout = QHBoxLayout()
-            
-            save_btn = QPushButton("Enregistrer")
-            save_btn.clicked.connect(lambda: self.save_dashboard_settings(
-                refresh_spinbox.value(),
-                main_checkbox.isChecked(),
-                financial_checkbox.isChecked(),
-                patient_checkbox.isChecked(),
-                dialog
-            ))
-            buttons_layout.addWidget(save_btn)
-            
-            cancel_btn = QPushButton("Annuler")
-            cancel_btn.clicked.connect(dialog.reject)
-            buttons_layout.addWidget(cancel_btn)
-            
-            layout.addLayout(buttons_layout)
-            
-            dialog.exec_()
+            self._settings_dialog.exec_()
             
         except Exception as e:
-            print(f"Error opening dashboard settings: {e}")
+            logger.exception("Error opening dashboard settings")
     
-    def save_dashboard_settings(self, refresh_interval, main_enabled, financial_enabled, patient_enabled, dialog):
+    def save_dashboard_settings(self, refresh_interval, cache_ttl, main_enabled, financial_enabled, patient_enabled, dialog):
         """Save dashboard settings"""
         try:
+            # Remember the choices for the next sessions
+            self.settings.setValue("refresh_minutes", refresh_interval)
+            self.settings.setValue("cache_seconds", cache_ttl)
+            self.settings.setValue("main_enabled", main_enabled)
+            self.settings.setValue("financial_enabled", financial_enabled)
+            self.settings.setValue("patient_enabled", patient_enabled)
+            
+            # Update query cache lifetime
+            self.dashboard_service.ttl = cache_ttl
+            self.dashboard_service.invalidate()
+            
             # Update refresh timer
-            self.refresh_timer.stop()
-            self.refresh_timer.start(refresh_interval * 60000)  # Convert to milliseconds
+            self.refresh_interval_ms = refresh_interval * 60000  # Convert to milliseconds
+            if self.isVisible():
+                self._start_refresh_timer()
             
             # Enable/disable tabs (simplified implementation)
             # In a full implementation, you might want to hide/show tabs
@@ -402,7 +730,7 @@ class MainDashboardWidget(QWidget):
             )
             
         except Exception as e:
-            print(f"Error saving dashboard settings: {e}")
+            logger.exception("Error saving dashboard settings")
     
     def get_current_dashboard(self):
         """Get currently active dashboard"""
@@ -423,23 +751,30 @@ class MainDashboardWidget(QWidget):
         """Add a custom dashboard tab"""
         try:
             self.tab_widget.addTab(widget, title)
-            if hasattr(self, 'dashboards'):
-                self.dashboards.append(widget)
+            self._register_dashboard(widget)
         except Exception as e:
-            print(f"Error adding custom dashboard: {e}")
+            logger.exception("Error adding custom dashboard")
     
     def closeEvent(self, event):
         """Handle widget close event"""
         try:
-            # Stop refresh timer
-            if hasattr(self, 'refresh_timer'):
-                self.refresh_timer.stop()
-            
-            # Close dashboard service
+            # Stop refresh timers and break their connections to this widget
+            if hasattr(self, '_foreground_timer'):
+                self._stop_refresh_timer()
+                self._foreground_timer.timeout.disconnect()
+                self._background_stale_timer.timeout.disconnect()
+            
+            # Drop the dashboard widgets
+            self.tab_widget.clear()
+            self.dashboards.clear()
+            self._refreshables.clear()
+            
+            # Close dashboard service and its database session
             if hasattr(self, 'dashboard_service'):
+                self.dashboard_service.close()
                 del self.dashboard_service
                 
             event.accept()
         except Exception as e:
-            print(f"Error during dashboard close: {e}")
+            logger.exception("Error during dashboard close")
             event.accept()
@@ -6,24 +6,211 @@ Manages navigation between different views using QStackedWidget
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QStackedWidget, QMenuBar, QToolBar, QAction, 
                             QLabel, QStatusBar, QMessageBox, QApplication,
-                            QPushButton, QFrame, QSizePolicy, QDialog)
+                            QFrame, QSizePolicy, QDialog)
 from .dialogs.change_password_dialog import ChangePasswordDialog
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QIcon, QFont, QPixmap
+from PyQt5.QtCore import Qt, pyqtSignal, QObject, QRunnable, QThreadPool, QTimer
+from PyQt5.QtGui import QIcon, QFont, QPixmap, QKeySequence
 # Add these imports after the existing ones
-from ..sync_service import sync_service
+from ..sync_service import sync_service, SyncStatus
 from .sync_ui_components import SyncStatusWidget
 import sys
 import os
+import logging
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from importlib import import_module
+
+logger = logging.getLogger(__name__)
 
 # Import expense service
 from ..services.expense_service import ExpenseService
+from ..models.database import DatabaseManager
+from .expense_management_widget import ExpenseManagementWidget
+
+@lru_cache(maxsize=1)
+def _dashboard_widget_class():
+    """Import the dashboard module on first use; it pulls in matplotlib"""
+    from .main_dashboard_widget import MainDashboardWidget
+    return MainDashboardWidget
+
+_MAIN_QSS = """
+QMainWindow {
+    background-color: #f5f5f5;
+}
+QMenuBar {
+    background-color: #2E7D32;
+    color: white;
+    border: none;
+    padding: 5px;
+}
+QMenuBar::item {
+    background-color: transparent;
+    padding: 8px 16px;
+    border-radius: 4px;
+}
+QMenuBar::item:selected {
+    background-color: #388E3C;
+}
+QToolBar {
+    background-color: #4CAF50;
+    border: none;
+    spacing: 3px;
+    padding: 5px;
+}
+QToolBar QToolButton {
+    background-color: transparent;
+    color: white;
+    border: none;
+    padding: 8px 16px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+QToolBar QToolButton:hover {
+    background-color: #45a049;
+}
+QToolBar QToolButton:pressed {
+    background-color: #3d8b40;
+}
+QStatusBar {
+    background-color: #e0e0e0;
+    border-top: 1px solid #ccc;
+}
+"""
+
+class _SyncStartSignals(QObject):
+    """Signals emitted by the sync start worker"""
+    finished = pyqtSignal(str)
+
+class _SyncStartWorker(QRunnable):
+    """Start the background sync service (and its database probe) on the thread pool"""
+    
+    def __init__(self):
+        super().__init__()
+        self.signals = _SyncStartSignals()
+    
+    def run(self):
+        try:
+            sync_service.start_background_sync()
+            self.signals.finished.emit("Service de synchronisation démarré")
+        except Exception as e:
+            logger.exception("Error starting sync service")
+            self.signals.finished.emit("Erreur: Service de synchronisation non démarré")
+
+class _DashboardPreloadWorker(QRunnable):
+    """Import the dashboard's numeric libraries on the thread pool ahead of its first opening"""
+    
+    # No Qt code in these, so they are safe to import off the GUI thread
+    MODULES = ('numpy', 'scipy.interpolate', 'matplotlib.figure')
+    
+    def run(self):
+        for name in self.MODULES:
+            try:
+                import_module(name)
+            except ImportError:
+                # Optional (scipy); the dashboard copes without it
+                pass
+            except Exception as e:
+                logger.exception("Error preloading %s", name)
+
+class _SyncSignals(QObject):
+    """Signals emitted by the manual sync worker"""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+class _SyncWorker(QRunnable):
+    """Run a manual Supabase synchronization on the thread pool"""
+    
+    def __init__(self, service):
+        super().__init__()
+        self.service = service
+        self.signals = _SyncSignals()
+    
+    def run(self):
+        try:
+            self.signals.finished.emit(self.service.sync_now())
+        except Exception as e:
+            logger.exception("Error in sync_to_supabase")
+            self.signals.error.emit(str(e))
 
 class MainWindow(QMainWindow):
     """Main application window with navigation and view management"""
     
-    def __init__(self, auth_service, patient_service, visit_service, inventory_service=None):
+    # Emitted after the user confirmed a logout
+    logout_requested = pyqtSignal()
+    # Emitted with the view key after a view was destroyed to free memory
+    view_evicted = pyqtSignal(str)
+    
+    # Menu commands: key -> (label, shortcuts, slot name); each becomes self.act_<key>
+    _ACTION_SPEC = {
+        'backup': ('Sauvegarder la base de données', ('Ctrl+B',), 'backup_database'),
+        'exit': ('Quitter', ('Ctrl+Q',), 'close'),
+        'dashboard': ('Tableaux de Bord', ('Ctrl+D',), 'show_dashboards'),
+        'patient_list': ('Liste des patients', ('Ctrl+P', 'Ctrl+L'), 'show_patient_list'),
+        'add_patient': ('Ajouter un patient', ('Ctrl+N',), 'show_add_patient'),
+        'unpaid_balances': ('Soldes impayés', ('Ctrl+U',), 'show_unpaid_balances'),
+        'inventory': ('Gestion des Stocks', ('Ctrl+I',), 'show_inventory'),
+        'low_stock': ('Stock Faible', (), 'show_low_stock'),
+        'expenses': ('Gestion des dépenses', ('Ctrl+E',), 'show_expenses'),
+        'search': ('Rechercher', ('Ctrl+F',), 'focus_search'),
+        'sync': ('Synchroniser avec Supabase', ('Ctrl+S',), 'sync_to_supabase'),
+        'about': ('À propos', (), 'show_about'),
+        'change_password': ('Changer le mot de passe', (), 'change_password'),
+        'logout': ('Se déconnecter', (), 'logout'),
+    }
+    
+    # Toolbar label and tooltip for the menu actions also shown in the toolbar
+    _TOOLBAR_TEXT = {
+        'dashboard': (' Tableau de Bord', 'Afficher les tableaux de bord'),
+        'patient_list': (' Patients', 'Gestion des patients'),
+        'add_patient': (' Nouveau Patient', 'Ajouter un nouveau patient'),
+        'unpaid_balances': (' Impayés', 'Voir les soldes impayés'),
+        'expenses': (' Dépenses', 'Gestion des dépenses'),
+        'inventory': ('Inventaire', "Gestion de l'inventaire"),
+        'sync': ('Synchroniser', 'Synchroniser avec Supabase'),
+        'logout': ('Déconnexion', None),
+    }
+    
+    # Method each data view uses to reload itself
+    _REFRESH_METHODS = {
+        'patient_list': 'refresh_patients',
+        'unpaid_balances': 'refresh_data',
+        'inventory': 'refresh_data',
+        'expense': 'refresh_data',
+        'dashboard': 'invalidate_data',
+    }
+    
+    # Views whose data may change while the user works in a given view
+    _VIEW_INVALIDATES = {
+        'patient_list': ('unpaid_balances', 'dashboard'),
+        'patient_detail': ('patient_list', 'unpaid_balances', 'dashboard'),
+        'unpaid_balances': ('patient_list', 'dashboard'),
+        'inventory': ('dashboard',),
+        'expense': ('dashboard',),
+    }
+    
+    # Heavy views released when unused, and how many of them stay in memory; the
+    # patient-facing lists are opened too often to be rebuilt each time
+    _EVICTABLE_VIEWS = ('dashboard', 'expense')
+    MAX_CACHED_HEAVY_VIEWS = 1
+    
+    # Menu bar layout, in display order; None inserts a separator and (key, label)
+    # lists a command under a label of its own in that menu
+    _MENU_SPEC = (
+        ('Fichier', ('backup', None, 'exit')),
+        ('Affichage', ('dashboard', None, 'patient_list', 'unpaid_balances',
+                       ('inventory', 'Inventaire'), 'expenses')),
+        ('Patients', ('patient_list', 'add_patient')),
+        ('Visites', ('unpaid_balances',)),
+        ('Stocks', ('inventory', 'low_stock')),
+        ('Outils', ('search', 'sync')),
+        ('Aide', ('about',)),
+        ('Dépenses', ('expenses',)),
+        ('Utilisateur', ('change_password', None, 'logout')),
+    )
+    
+    def __init__(self, auth_service, patient_service, visit_service, inventory_service=None, db_manager=None):
         super().__init__()
+        self.db_manager = db_manager or DatabaseManager()
         self.auth_service = auth_service
         self.patient_service = patient_service
         self.visit_service = visit_service
@@ -31,12 +218,17 @@ class MainWindow(QMainWindow):
         self.expense_service = ExpenseService()  # Initialize expense service
         self.current_user = None
         
+        # Set once a close has already been confirmed (e.g. by logout)
+        self._closing = False
+        
         self.init_ui()
         self.create_menu_bar()
         self.create_toolbar()
         self.create_status_bar()
-        self.start_sync_service()
         self.add_sync_status_widget()
+        
+        # Start syncing once the window is up rather than before the first paint
+        QTimer.singleShot(0, self.start_sync_service)
     
     def init_ui(self):
         """Initialize the main user interface"""
@@ -45,49 +237,7 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(1000, 600)
         
         # Set application style
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f5f5f5;
-            }
-            QMenuBar {
-                background-color: #2E7D32;
-                color: white;
-                border: none;
-                padding: 5px;
-            }
-            QMenuBar::item {
-                background-color: transparent;
-                padding: 8px 16px;
-                border-radius: 4px;
-            }
-            QMenuBar::item:selected {
-                background-color: #388E3C;
-            }
-            QToolBar {
-                background-color: #4CAF50;
-                border: none;
-                spacing: 3px;
-                padding: 5px;
-            }
-            QToolBar QPushButton {
-                background-color: transparent;
-                color: white;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QToolBar QPushButton:hover {
-                background-color: #45a049;
-            }
-            QToolBar QPushButton:pressed {
-                background-color: #3d8b40;
-            }
-            QStatusBar {
-                background-color: #e0e0e0;
-                border-top: 1px solid #ccc;
-            }
-        """)
+        self.setStyleSheet(_MAIN_QSS)
         
         # Central widget with stacked layout for different views
         central_widget = QWidget()
@@ -100,7 +250,23 @@ class MainWindow(QMainWindow):
         self.stacked_widget = QStackedWidget()
         layout.addWidget(self.stacked_widget)
         
-        # Initialize views (will be set later)
+        # Views are built on first use by the factories registered here
+        # (see register_view); until then their widget attributes stay None
+        self._view_factories = {
+            'dashboard': self._create_dashboard_widget,
+            'expense': self._create_expense_widget,
+        }
+        self._view_created_hooks = {}
+        
+        # Stacked widget index of each view built so far
+        self._view_indices = {}
+        
+        # Views needing a reload before they are shown again
+        self._view_dirty = defaultdict(lambda: True)
+        
+        # Heavy views currently built, least recently shown first
+        self._view_lru = OrderedDict()
+        
         self.patient_list_widget = None
         self.patient_form_widget = None
         self.patient_detail_widget = None
@@ -111,202 +277,102 @@ class MainWindow(QMainWindow):
         self.expense_widget = None
         self.dashboard_widget = None
         
+        # Confirmation boxes reused instead of rebuilt (and restyled) on every use
+        self._confirm_close = self._create_confirm_box(
+            "Fermer l'application",
+            "Êtes-vous sûr de vouloir fermer l'application?"
+        )
+        self._confirm_logout = self._create_confirm_box(
+            "Déconnexion",
+            "Êtes-vous sûr de vouloir vous déconnecter?"
+        )
+    
+    def _create_confirm_box(self, title, text):
+        """Create a Yes/No question box defaulting to No"""
+        box = QMessageBox(QMessageBox.Question, title, text, QMessageBox.Yes | QMessageBox.No, self)
+        box.setDefaultButton(QMessageBox.No)
+        return box
+    
+    def _show_message(self, icon, title, text):
+        """Show a message in its own box, so messages raised while another is open are not lost"""
+        box = QMessageBox(icon, title, text, QMessageBox.Ok, self)
+        box.exec_()
+        box.deleteLater()
+        
     def create_menu_bar(self):
         """Create the application menu bar"""
         menubar = self.menuBar()
         
-        # File menu
-        file_menu = menubar.addMenu('Fichier')
-        
-        backup_action = QAction('Sauvegarder la base de données', self)
-        backup_action.setShortcut('Ctrl+B')
-        backup_action.triggered.connect(self.backup_database)
-        file_menu.addAction(backup_action)
-        
-        file_menu.addSeparator()
-        
-        exit_action = QAction('Quitter', self)
-        exit_action.setShortcut('Ctrl+Q')
-        exit_action.triggered.connect(self.close)
-        file_menu.addAction(exit_action)
-        
-        # View menu
-        view_menu = menubar.addMenu('Affichage')
-        
-        dashboard_action = QAction('Tableaux de Bord', self)
-        dashboard_action.setShortcut('Ctrl+D')
-        dashboard_action.triggered.connect(self.show_dashboards)
-        view_menu.addAction(dashboard_action)
-        
-        view_menu.addSeparator()
-        
-        patient_list_action = QAction('Liste des patients', self)
-        patient_list_action.setShortcut('Ctrl+P')
-        patient_list_action.triggered.connect(self.show_patient_list)
-        view_menu.addAction(patient_list_action)
-        
-        unpaid_action = QAction('Soldes impayés', self)
-        unpaid_action.setShortcut('Ctrl+U')
-        unpaid_action.triggered.connect(self.show_unpaid_balances)
-        view_menu.addAction(unpaid_action)
-        
-        inventory_action = QAction('Inventaire', self)
-        inventory_action.setShortcut('Ctrl+I')
-        inventory_action.triggered.connect(self.show_inventory)
-        view_menu.addAction(inventory_action)
-        
-        expenses_action = QAction('Gestion des dépenses', self)
-        expenses_action.setShortcut('Ctrl+E')
-        expenses_action.triggered.connect(self.show_expenses)
-        view_menu.addAction(expenses_action)
-        
-        # Patients menu
-        patients_menu = menubar.addMenu('Patients')
-        
-        list_patients_action = QAction('Liste des patients', self)
-        list_patients_action.setShortcut('Ctrl+L')
-        list_patients_action.triggered.connect(self.show_patient_list)
-        patients_menu.addAction(list_patients_action)
-        
-        add_patient_action = QAction('Ajouter un patient', self)
-        add_patient_action.setShortcut('Ctrl+N')
-        add_patient_action.triggered.connect(self.show_add_patient)
-        patients_menu.addAction(add_patient_action)
-        
-        # Visits menu
-        visits_menu = menubar.addMenu('Visites')
-        
-        unpaid_action = QAction('Soldes impayés', self)
-        unpaid_action.triggered.connect(self.show_unpaid_balances)
-        visits_menu.addAction(unpaid_action)
-        
-        # Inventory menu
-        inventory_menu = menubar.addMenu('Stocks')
-        
-        manage_inventory_action = QAction('Gestion des Stocks', self)
-        manage_inventory_action.setShortcut('Ctrl+I')
-        manage_inventory_action.triggered.connect(self.show_inventory)
-        inventory_menu.addAction(manage_inventory_action)
-        
-        low_stock_action = QAction('Stock Faible', self)
-        low_stock_action.triggered.connect(self.show_low_stock)
-        inventory_menu.addAction(low_stock_action)
-        
-        # In the create_menu_bar method, add this to the tools_menu section:
-        
-        # Tools menu
-        tools_menu = menubar.addMenu('Outils')
-        
-        search_action = QAction('Rechercher', self)
-        search_action.setShortcut('Ctrl+F')
-        search_action.triggered.connect(self.focus_search)
-        tools_menu.addAction(search_action)
-        # Add this in the tools_menu section of create_menu_bar
-        # Add sync action
-        sync_action = QAction('Synchroniser avec Supabase', self)
-        sync_action.setShortcut('Ctrl+S')
-        sync_action.triggered.connect(self.sync_to_supabase)
-        tools_menu.addAction(sync_action)
-        
-        # Help menu
-        help_menu = menubar.addMenu('Aide')
-        
-        about_action = QAction('À propos', self)
-        about_action.triggered.connect(self.show_about)
-        help_menu.addAction(about_action)
-        
-        # Expenses menu
-        expenses_menu = menubar.addMenu('Dépenses')
-        
-        manage_expenses_action = QAction('Gestion des Dépenses', self)
-        manage_expenses_action.setShortcut('Ctrl+D')
-        manage_expenses_action.triggered.connect(self.show_expenses)
-        expenses_menu.addAction(manage_expenses_action)
-        
-        # User menu (right side)
-        user_menu = menubar.addMenu('Utilisateur')
-        
-        change_password_action = QAction('Changer le mot de passe', self)
-        change_password_action.triggered.connect(self.change_password)
-        user_menu.addAction(change_password_action)
-        
-        user_menu.addSeparator()
-        
-        logout_action = QAction('Se déconnecter', self)
-        logout_action.triggered.connect(self.logout)
-        user_menu.addAction(logout_action)
+        # One QAction per command, shared by every menu that lists it
+        for key, (label, shortcuts, slot_name) in self._ACTION_SPEC.items():
+            action = QAction(label, self)
+            action.setShortcuts([QKeySequence(shortcut) for shortcut in shortcuts])
+            action.triggered.connect(getattr(self, slot_name))
+            setattr(self, f'act_{key}', action)
+        
+        for title, keys in self._MENU_SPEC:
+            menu = menubar.addMenu(title)
+            for key in keys:
+                if key is None:
+                    menu.addSeparator()
+                elif isinstance(key, tuple):
+                    # Relabelled entry; triggers the shared action, which owns the shortcut
+                    key, label = key
+                    entry = menu.addAction(label)
+                    entry.triggered.connect(getattr(self, f'act_{key}').trigger)
+                else:
+                    menu.addAction(getattr(self, f'act_{key}'))
     
     def create_toolbar(self):
         """Create the main toolbar"""
         toolbar = self.addToolBar('Navigation')
         toolbar.setMovable(False)
         
-        # Dashboard button
-        dashboard_btn = QPushButton(' Tableau de Bord')
-        dashboard_btn.setToolTip('Afficher les tableaux de bord')
-        dashboard_btn.clicked.connect(self.show_dashboards)
-        toolbar.addWidget(dashboard_btn)
-        
-        # Separator
-        toolbar.addSeparator()
-        
-        # Patient management buttons
-        patients_btn = QPushButton(' Patients')
-        patients_btn.setToolTip('Gestion des patients')
-        patients_btn.clicked.connect(self.show_patient_list)
-        toolbar.addWidget(patients_btn)
-        
-        add_patient_btn = QPushButton(' Nouveau Patient')
-        add_patient_btn.setToolTip('Ajouter un nouveau patient')
-        add_patient_btn.clicked.connect(self.show_add_patient)
-        toolbar.addWidget(add_patient_btn)
-        
-        # Separator
-        toolbar.addSeparator()
-        
-        # Financial buttons
-        unpaid_btn = QPushButton(' Impayés')
-        unpaid_btn.setToolTip('Voir les soldes impayés')
-        unpaid_btn.clicked.connect(self.show_unpaid_balances)
-        toolbar.addWidget(unpaid_btn)
-        
-        expenses_btn = QPushButton(' Dépenses')
-        expenses_btn.setToolTip('Gestion des dépenses')
-        expenses_btn.clicked.connect(self.show_expenses)
-        toolbar.addWidget(expenses_btn)
-        
-        # Separator
-        toolbar.addSeparator()
-        
-        # Inventory button
-        inventory_btn = QPushButton('Inventaire')
-        inventory_btn.setToolTip('Gestion de l\'inventaire')
-        inventory_btn.clicked.connect(self.show_inventory)
-        toolbar.addWidget(inventory_btn)
-        
-        # Add this in the create_toolbar method, before the spacer
-        # Separator
-        toolbar.addSeparator()
-        
-        # Sync button
-        sync_btn = QPushButton('Synchroniser')
-        sync_btn.setToolTip('Synchroniser avec Supabase')
-        sync_btn.clicked.connect(self.sync_to_supabase)
-        toolbar.addWidget(sync_btn)
+        # Toolbar buttons reuse the menu actions, with a shorter label and a tooltip
+        for key, (text, tooltip) in self._TOOLBAR_TEXT.items():
+            action = getattr(self, f'act_{key}')
+            action.setIconText(text)
+            if tooltip:
+                action.setToolTip(tooltip)
         
         # Add stretch to push user info to the right
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        toolbar.addWidget(spacer)
         
         # User info label
         self.user_label = QLabel()
         self.user_label.setStyleSheet("color: white; font-weight: bold; padding: 5px;")
-        toolbar.addWidget(self.user_label)
         
-        logout_btn = QPushButton('Déconnexion')
-        logout_btn.clicked.connect(self.logout)
-        toolbar.addWidget(logout_btn)
+        # Toolbar content in order; None is a separator
+        items = [
+            self.act_dashboard,
+            None,
+            self.act_patient_list, self.act_add_patient,
+            None,
+            self.act_unpaid_balances, self.act_expenses,
+            None,
+            self.act_inventory,
+            None,
+            self.act_sync,
+            spacer,
+            self.user_label,
+            self.act_logout,
+        ]
+        
+        # Fill the toolbar in one pass without intermediate relayouts
+        toolbar.setUpdatesEnabled(False)
+        toolbar.blockSignals(True)
+        try:
+            for item in items:
+                if item is None:
+                    toolbar.addSeparator()
+                elif isinstance(item, QAction):
+                    toolbar.addAction(item)
+                else:
+                    toolbar.addWidget(item)
+        finally:
+            toolbar.blockSignals(False)
+            toolbar.setUpdatesEnabled(True)
     
     def create_status_bar(self):
         """Create the status bar"""
@@ -317,6 +383,13 @@ class MainWindow(QMainWindow):
         self.status_label = QLabel("Prêt")
         self.status_bar.addWidget(self.status_label)
         
+        # Coalesces status messages posted in quick succession
+        self._pending_status = "Prêt"
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(33)
+        self._status_timer.timeout.connect(self._flush_status)
+        
         # Add permanent widgets to the right
         self.status_bar.addPermanentWidget(QLabel("DentisteDB v1.0"))
     
@@ -325,109 +398,160 @@ class MainWindow(QMainWindow):
         self.current_user = user
         if user:
             self.user_label.setText(f"Connecté: {user.username}")
-            self.status_label.setText(f"Connecté en tant que {user.username}")
+            self.update_status(f"Connecté en tant que {user.username}")
     
     def add_view(self, widget, name):
         """Add a view to the stacked widget"""
         index = self.stacked_widget.addWidget(widget)
         return index
     
+    def register_view(self, key, factory, on_created=None):
+        """
+        Register a factory for the view `key`, built the first time it is shown
+        The widget is stored as `<key>_widget` and passed to on_created once built
+        """
+        self._view_factories[key] = factory
+        if on_created:
+            self._view_created_hooks[key] = on_created
+    
+    def _create_view(self, key):
+        """Build the view `key`, add it to the stack and return its index"""
+        widget = self._view_factories[key]()
+        setattr(self, f'{key}_widget', widget)
+        index = self._view_indices[key] = self.add_view(widget, key)
+        on_created = self._view_created_hooks.get(key)
+        if on_created:
+            on_created(widget)
+        # A new view loads its data when built
+        self._view_dirty[key] = False
+        return index
+    
+    def _ensure_view(self, key):
+        """Create the view `key` if needed and return its stacked widget index"""
+        index = self._view_indices.get(key)
+        if index is None:
+            index = self._create_view(key)
+        return index
+    
+    def _evict_view(self, key):
+        """Destroy the view `key`; it is rebuilt by its factory when shown again"""
+        widget = getattr(self, f'{key}_widget')
+        self.stacked_widget.removeWidget(widget)
+        widget.close()
+        widget.deleteLater()
+        del self._view_indices[key]
+        setattr(self, f'{key}_widget', None)
+        
+        # Removing a page shifts the indices of the pages after it
+        for other in self._view_indices:
+            self._view_indices[other] = self.stacked_widget.indexOf(getattr(self, f'{other}_widget'))
+        
+        self.view_evicted.emit(key)
+    
+    def _touch_view(self, key):
+        """Record that a heavy view was shown and release the least recently used ones"""
+        if key not in self._EVICTABLE_VIEWS:
+            return
+        self._view_lru[key] = True
+        self._view_lru.move_to_end(key)
+        while len(self._view_lru) > self.MAX_CACHED_HEAVY_VIEWS:
+            oldest, _ = self._view_lru.popitem(last=False)
+            self._evict_view(oldest)
+    
+    def open_view(self, key):
+        """Show the view `key`, building it first if needed, and return its widget"""
+        self.show_view(self._ensure_view(key))
+        self._touch_view(key)
+        for other in self._VIEW_INVALIDATES.get(key, ()):
+            self._view_dirty[other] = True
+        return getattr(self, f'{key}_widget')
+    
+    def _open_data_view(self, key):
+        """Show a data view, reloading it only if its data may have changed"""
+        widget = self.open_view(key)
+        if self._view_dirty[key]:
+            refresh = getattr(widget, self._REFRESH_METHODS[key], None)
+            # A refresh method returns False when it could not queue the reload;
+            # the view then stays dirty and is retried when it is next opened
+            self._view_dirty[key] = refresh is not None and refresh() is False
+        return widget
+    
+    def mark_data_changed(self):
+        """Flag every data view for a reload after patients or visits were saved"""
+        for key in self._REFRESH_METHODS:
+            self._view_dirty[key] = True
+    
     def show_view(self, index):
         """Show a specific view by index"""
         self.stacked_widget.setCurrentIndex(index)
     
     def show_patient_list(self):
         """Show the patient list view"""
-        if hasattr(self, 'patient_list_index'):
-            self.show_view(self.patient_list_index)
-            # Refresh the patient list
-            if self.patient_list_widget:
-                self.patient_list_widget.refresh_patients()
+        self._open_data_view('patient_list')
     
     def show_add_patient(self):
         """Show the add patient form"""
-        if hasattr(self, 'patient_form_index'):
-            self.show_view(self.patient_form_index)
-            # Clear the form for new patient
-            if self.patient_form_widget:
-                self.patient_form_widget.clear_form()
+        # Clear the form for new patient
+        self.open_view('patient_form').clear_form()
     
     def show_patient_detail(self, patient_id):
         """Show patient detail view"""
-        if hasattr(self, 'patient_detail_index'):
-            self.show_view(self.patient_detail_index)
-            if self.patient_detail_widget:
-                self.patient_detail_widget.load_patient(patient_id)
+        self.open_view('patient_detail').load_patient(patient_id)
     
     def show_unpaid_balances(self):
         """Show unpaid balances view"""
-        if hasattr(self, 'unpaid_balances_index'):
-            self.show_view(self.unpaid_balances_index)
-            if self.unpaid_balances_widget:
-                self.unpaid_balances_widget.refresh_data()
+        self._open_data_view('unpaid_balances')
     
     def show_inventory(self):
         """Show inventory management view"""
-        if hasattr(self, 'inventory_index'):
-            self.show_view(self.inventory_index)
-            if self.inventory_widget:
-                self.inventory_widget.refresh_data()
+        self._open_data_view('inventory')
     
     def show_low_stock(self):
         """Show inventory management view with low stock tab active"""
-        if hasattr(self, 'inventory_index'):
-            self.show_view(self.inventory_index)
-            if self.inventory_widget:
-                self.inventory_widget.tab_widget.setCurrentIndex(1)  # Low stock tab
-                self.inventory_widget.refresh_data()
-                
+        inventory_widget = self._open_data_view('inventory')
+        inventory_widget.tab_widget.setCurrentIndex(1)  # Low stock tab
+    
+    def _create_dashboard_widget(self):
+        """Build the dashboard view, or an error placeholder if it cannot load"""
+        try:
+            MainDashboardWidget = _dashboard_widget_class()
+            
+            # Get database session for real data
+            session = self.db_manager.get_session()
+            logger.info("Database session created for dashboards")
+            
+            dashboard_widget = MainDashboardWidget(
+                parent=self,
+                session=session,
+                patient_service=self.patient_service,
+                visit_service=self.visit_service,
+                expense_service=self.expense_service
+            )
+            logger.info("Dashboard widget created with real data connection")
+            return dashboard_widget
+        except Exception as e:
+            logger.exception("Error creating dashboard widget")
+            # Create a simple error widget
+            error_widget = QWidget()
+            error_layout = QVBoxLayout(error_widget)
+            error_label = QLabel(f"Erreur lors du chargement des tableaux de bord:\n{str(e)}")
+            error_label.setStyleSheet("color: red; font-size: 16px; padding: 50px;")
+            error_label.setAlignment(Qt.AlignCenter)
+            error_layout.addWidget(error_label)
+            return error_widget
+    
     def show_dashboards(self):
         """Show dashboard view with real data"""
-        if not hasattr(self, 'dashboard_index'):
-            try:
-                from .main_dashboard_widget import MainDashboardWidget
-                
-                # Get database session for real data
-                session = None
-                if hasattr(self, 'db_manager') and self.db_manager:
-                    session = self.db_manager.get_session()
-                    print("Database session created for dashboards")
-                
-                self.dashboard_widget = MainDashboardWidget(
-                    parent=self,
-                    session=session,
-                    patient_service=self.patient_service,
-                    visit_service=self.visit_service,
-                    expense_service=self.expense_service
-                )
-                self.dashboard_index = self.stacked_widget.addWidget(self.dashboard_widget)
-                print("Dashboard widget created with real data connection")
-            except Exception as e:
-                print(f"Error creating dashboard widget: {e}")
-                # Create a simple error widget
-                error_widget = QWidget()
-                error_layout = QVBoxLayout(error_widget)
-                error_label = QLabel(f"Erreur lors du chargement des tableaux de bord:\n{str(e)}")
-                error_label.setStyleSheet("color: red; font-size: 16px; padding: 50px;")
-                error_label.setAlignment(Qt.AlignCenter)
-                error_layout.addWidget(error_label)
-                self.dashboard_index = self.stacked_widget.addWidget(error_widget)
-        
-        self.show_view(self.dashboard_index)
-        if self.dashboard_widget and hasattr(self.dashboard_widget, 'refresh_all_dashboards'):
-            self.dashboard_widget.refresh_all_dashboards()
+        self._open_data_view('dashboard')
         self.update_status("Tableaux de bord affichés")
     
+    def _create_expense_widget(self):
+        """Build the expense management view"""
+        return ExpenseManagementWidget(expense_service=self.expense_service)
+    
     def show_expenses(self):
         """Show expense management view"""
-        if not hasattr(self, 'expense_index'):
-            from .expense_management_widget import ExpenseManagementWidget
-            self.expense_widget = ExpenseManagementWidget(expense_service=self.expense_service)
-            self.expense_index = self.stacked_widget.addWidget(self.expense_widget)
-        
-        self.show_view(self.expense_index)
-        if self.expense_widget:
-            self.expense_widget.refresh_data()
+        self._open_data_view('expense')
     
     def focus_search(self):
         """Focus on search field in current view"""
@@ -438,20 +562,18 @@ class MainWindow(QMainWindow):
     def backup_database(self):
         """Create database backup"""
         try:
-            from ..models.database import DatabaseManager
-            db_manager = DatabaseManager()
-            backup_path = db_manager.backup_database()
+            backup_path = self.db_manager.backup_database()
             
-            QMessageBox.information(
-                self,
+            self._show_message(
+                QMessageBox.Information,
                 "Sauvegarde réussie",
                 f"Base de données sauvegardée avec succès:\n{backup_path}"
             )
-            self.status_label.setText("Sauvegarde créée avec succès")
+            self.update_status("Sauvegarde créée avec succès")
             
         except Exception as e:
-            QMessageBox.critical(
-                self,
+            self._show_message(
+                QMessageBox.Critical,
                 "Erreur de sauvegarde",
                 f"Erreur lors de la sauvegarde:\n{str(e)}"
             )
@@ -462,25 +584,19 @@ class MainWindow(QMainWindow):
         result = dialog.exec_()
         
         if result == QDialog.Accepted:
-            self.status_label.setText("Mot de passe modifié avec succès")
+            self.update_status("Mot de passe modifié avec succès")
         else:
-            self.status_label.setText("Changement de mot de passe annulé")
+            self.update_status("Changement de mot de passe annulé")
     
     def logout(self):
         """Logout current user"""
-        reply = QMessageBox.question(
-            self,
-            "Déconnexion",
-            "Êtes-vous sûr de vouloir vous déconnecter?",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
-        )
-        
-        if reply == QMessageBox.Yes:
+        if self._confirm_logout.exec_() == QMessageBox.Yes:
             self.auth_service.logout()
+            # Already confirmed, closeEvent must not ask again
+            self._closing = True
             self.close()
             # Signal to show login window again
-            self.logout_requested.emit() if hasattr(self, 'logout_requested') else None
+            self.logout_requested.emit()
     
     def show_about(self):
         """Show about dialog"""
@@ -503,13 +619,20 @@ class MainWindow(QMainWindow):
         )
     
     def start_sync_service(self):
-        """Start the background sync service"""
-        try:
-            sync_service.start_background_sync()
-            self.status_label.setText("Service de synchronisation démarré")
-        except Exception as e:
-            print(f"Error starting sync service: {e}")
-            self.status_label.setText("Erreur: Service de synchronisation non démarré")
+        """Start the background sync service without blocking the GUI thread"""
+        worker = _SyncStartWorker()
+        worker.signals.finished.connect(self.on_sync_service_started)
+        QThreadPool.globalInstance().start(worker)
+        
+        # Import matplotlib, numpy and scipy while the user is still on the first view
+        QThreadPool.globalInstance().start(_DashboardPreloadWorker())
+    
+    def on_sync_service_started(self, message):
+        """Show the sync service start result"""
+        self.update_status(message)
+        # The status callback fired on the worker thread; refresh from the GUI thread
+        if hasattr(self, 'sync_status_widget'):
+            self.sync_status_widget.update_status_display()
 
     def add_sync_status_widget(self):
         """Add sync status widget to the status bar"""
@@ -517,7 +640,7 @@ class MainWindow(QMainWindow):
             self.sync_status_widget = SyncStatusWidget()
             self.status_bar.addPermanentWidget(self.sync_status_widget)
         except Exception as e:
-            print(f"Error adding sync status widget: {e}")
+            logger.exception("Error adding sync status widget")
             # Create a simple error label instead
             error_label = QLabel("Sync: Error")
             error_label.setStyleSheet("color: red;")
@@ -525,64 +648,84 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close event"""
-        reply = QMessageBox.question(
-            self,
-            "Fermer l'application",
-            "Êtes-vous sûr de vouloir fermer l'application?",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
-        )
+        if not self._closing:
+            if self._confirm_close.exec_() != QMessageBox.Yes:
+                event.ignore()
+                return
+        self._closing = False
         
-        if reply == QMessageBox.Yes:
-            try:
-                sync_service.stop_background_sync()
-            except Exception as e:
-                print(f"Error stopping sync service: {e}")
-            
-            # Perform cleanup
-            if self.auth_service:
-                self.auth_service.logout()
-            event.accept()
-        else:
-            event.ignore()
+        try:
+            sync_service.stop_background_sync()
+        except Exception as e:
+            logger.exception("Error stopping sync service")
+        
+        # Perform cleanup
+        if self.auth_service:
+            self.auth_service.logout()
+        event.accept()
     
     def update_status(self, message):
-        """Update status bar message"""
-        self.status_label.setText(message)
+        """Update status bar message; bursts of updates are painted at most ~30 times a second"""
+        self._pending_status = message
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+    
+    def _flush_status(self):
+        """Show the latest pending status message"""
+        self.status_label.setText(self._pending_status)
 
     def sync_to_supabase(self):
-        """Trigger manual synchronization with Supabase"""
-        try:
-            # Trigger immediate sync via the background service
-            result = sync_service.sync_now()
-            
-            if result and result.status.value == "success":
-                total_synced = result.patients_synced + result.visits_synced
-                QMessageBox.information(
-                    self,
-                    "Synchronisation réussie",
-                    f"Synchronisation terminée avec succès!\n"
-                    f"Patients synchronisés: {result.patients_synced}\n"
-                    f"Visites synchronisées: {result.visits_synced}\n"
-                    f"Total: {total_synced} enregistrements"
-                )
-            elif result:
-                QMessageBox.warning(
-                    self,
-                    "Synchronisation",
-                    f"Statut de synchronisation: {result.message}"
-                )
-            else:
-                QMessageBox.warning(
-                    self,
-                    "Synchronisation",
-                    "Erreur: Impossible de démarrer la synchronisation"
-                )
-                
-        except Exception as e:
-            print(f"Error in sync_to_supabase: {e}")
-            QMessageBox.critical(
-                self,
-                "Erreur de synchronisation",
-                f"Erreur lors de la synchronisation:\n{str(e)}"
+        """Trigger manual synchronization with Supabase in the background"""
+        self.act_sync.setEnabled(False)
+        self.update_status("Synchronisation en cours...")
+        
+        worker = _SyncWorker(sync_service)
+        worker.signals.finished.connect(self._on_sync_finished)
+        worker.signals.error.connect(self._on_sync_error)
+        QThreadPool.globalInstance().start(worker)
+    
+    def _on_sync_done(self):
+        """Re-enable manual sync and show the service status from the GUI thread"""
+        self.act_sync.setEnabled(True)
+        if hasattr(self, 'sync_status_widget'):
+            self.sync_status_widget.update_status_display()
+    
+    def _on_sync_finished(self, result):
+        """Report the result of a manual synchronization"""
+        self._on_sync_done()
+        
+        if result and result.status is SyncStatus.SUCCESS:
+            total_synced = result.patients_synced + result.visits_synced
+            self.update_status("Synchronisation terminée")
+            self._show_message(
+                QMessageBox.Information,
+                "Synchronisation réussie",
+                f"Synchronisation terminée avec succès!\n"
+                f"Patients synchronisés: {result.patients_synced}\n"
+                f"Visites synchronisées: {result.visits_synced}\n"
+                f"Total: {total_synced} enregistrements"
             )
+        elif result:
+            self.update_status("Synchronisation non effectuée")
+            self._show_message(
+                QMessageBox.Warning,
+                "Synchronisation",
+                f"Statut de synchronisation: {result.message}"
+            )
+        else:
+            self.update_status("Synchronisation non effectuée")
+            self._show_message(
+                QMessageBox.Warning,
+                "Synchronisation",
+                "Erreur: Impossible de démarrer la synchronisation"
+            )
+    
+    def _on_sync_error(self, message):
+        """Report a manual synchronization error"""
+        self._on_sync_done()
+        self.update_status("Erreur de synchronisation")
+        self._show_message(
+            QMessageBox.Critical,
+            "Erreur de synchronisation",
+            f"Erreur lors de la synchronisation:\n{message}"
+        )
@@ -4,18 +4,439 @@ Replaces patient_detail.html template with native PyQt interface
 """
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                            QTableWidget, QTableWidgetItem, QHeaderView, QFrame,
+                            QTableView, QHeaderView, QFrame,
                             QSplitter, QGroupBox, QScrollArea, QMessageBox, QMenu,
                             QAction, QSizePolicy, QTabWidget, QFormLayout, QTextEdit,
-                            QAbstractItemView, QDialog)
-from PyQt5.QtCore import Qt, pyqtSignal, QDate
-from PyQt5.QtGui import QFont, QPixmap, QIcon, QColor, QBrush
+                            QAbstractItemView, QDialog, QStyledItemDelegate,
+                            QStyleOptionViewItem)
+from PyQt5.QtCore import (Qt, pyqtSignal, QDate, QAbstractTableModel, QModelIndex, QTimer, QEvent,
+                          QObject, QRunnable, QThreadPool)
+from PyQt5.QtGui import QFont, QFontMetrics, QPainter, QPixmap, QPixmapCache, QImage, QIcon, QColor, QBrush, QPalette
 from .tooth_diagram_widget import ToothDiagramWidget
 from .invoice_widget import InvoiceWidget
 from ..services.tooth_service import ToothService
 import os
+from collections import OrderedDict
+from functools import lru_cache, partial
 from datetime import datetime
 
+# Tooth diagrams kept alive for the most recently viewed patients
+_TOOTH_DIAGRAM_CACHE_SIZE = 4
+
+# Decoded X-ray images kept for the most recently viewed patients
+_XRAY_CACHE_SIZE = 16
+# Quiet period after the last X-ray label resize before the smooth rescale
+_XRAY_SMOOTH_DELAY_MS = 150
+
+# Window in which repeated load_patient calls are coalesced
+_LOAD_DEBOUNCE_MS = 120
+
+_TAB_QSS = """
+QTabWidget::pane {
+    border: 1px solid #E5E7EB;
+    border-radius: 8px;
+    background-color: white;
+}
+QTabBar::tab {
+    background-color: #F3F4F6;
+    padding: 10px 20px;
+    margin-right: 2px;
+    border-top-left-radius: 8px;
+    border-top-right-radius: 8px;
+}
+QTabBar::tab:selected {
+    background-color: white;
+    border-bottom: 2px solid #3B82F6;
+}
+"""
+
+_HEADER_FRAME_QSS = """
+QFrame {
+    background-color: white;
+    border: 1px solid #ddd;
+    border-radius: 5px;
+    padding: 15px;
+}
+"""
+
+_BTN_PRIMARY_QSS = """
+QPushButton {
+    background-color: #2196F3;
+    color: white;
+    border: none;
+    padding: 10px 20px;
+    border-radius: 5px;
+    font-weight: bold;
+}
+QPushButton:hover {
+    background-color: #1976D2;
+}
+"""
+
+_BTN_SUCCESS_QSS = """
+QPushButton {
+    background-color: #4CAF50;
+    color: white;
+    border: none;
+    padding: 10px 20px;
+    border-radius: 5px;
+    font-weight: bold;
+}
+QPushButton:hover {
+    background-color: #45a049;
+}
+"""
+
+_BTN_WARN_QSS = """
+QPushButton {
+    background-color: #FF9800;
+    color: white;
+    border: none;
+    padding: 10px 20px;
+    border-radius: 5px;
+    font-weight: bold;
+}
+QPushButton:hover {
+    background-color: #F57C00;
+}
+"""
+
+# Applied once on the widget; the section group boxes pick it up by objectName
+_DETAIL_SECTION_QSS = """
+QGroupBox#detailSection {
+    font-weight: bold;
+    font-size: 14px;
+    color: #2E7D32;
+    border: 2px solid #ddd;
+    border-radius: 5px;
+    margin-top: 10px;
+    padding-top: 10px;
+}
+QGroupBox#detailSection::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px 0 5px;
+}
+"""
+
+_OBSERVATIONS_QSS = """
+QTextEdit {
+    border: 1px solid #ddd;
+    border-radius: 3px;
+    padding: 5px;
+    background-color: #f9f9f9;
+}
+"""
+
+_XRAY_LABEL_QSS = """
+QLabel {
+    border: 2px dashed #ddd;
+    border-radius: 5px;
+    background-color: #f9f9f9;
+    color: #666;
+}
+"""
+
+_XRAY_DELETE_BTN_QSS = """
+QPushButton {
+    background-color: #f44336;
+    color: white;
+    border: none;
+    padding: 8px 12px;
+    border-radius: 3px;
+    font-weight: bold;
+}
+QPushButton:hover {
+    background-color: #d32f2f;
+}
+QPushButton:disabled {
+    background-color: #cccccc;
+}
+"""
+
+_XRAY_BTN_QSS = """
+QPushButton {
+    background-color: #2196F3;
+    color: white;
+    border: none;
+    padding: 8px 12px;
+    border-radius: 3px;
+    font-weight: bold;
+}
+QPushButton:hover {
+    background-color: #1976D2;
+}
+QPushButton:disabled {
+    background-color: #cccccc;
+}
+"""
+
+_SUMMARY_LABEL_QSS = "font-weight: bold; color: #2E7D32; padding: 5px;"
+
+_VISITS_TABLE_QSS = """
+QTableView {
+    background-color: white;
+    border: 1px solid #ddd;
+    border-radius: 5px;
+    gridline-color: #e0e0e0;
+    selection-background-color: #E8F5E8;
+}
+QTableView::item {
+    padding: 8px;
+    border-bottom: 1px solid #e0e0e0;
+}
+QTableView::item:selected {
+    background-color: #E8F5E8;
+    color: #2E7D32;
+}
+QHeaderView::section {
+    background-color: #4CAF50;
+    color: white;
+    padding: 10px;
+    border: none;
+    font-weight: bold;
+}
+"""
+
+# Visits table columns sized to their contents (Date, Dent, Prix, Payé, Actions)
+_CONTENT_SIZED_VISIT_COLUMNS = (0, 1, 3, 4, 6)
+
+_VISIT_HEADERS = ("Date", "Dent", "Acte", "Prix", "Payé", "Reste", "Actions")
+_AMOUNT_ALIGNMENT = int(Qt.AlignRight | Qt.AlignVCenter)
+_VISIT_ALIGNMENTS = (None, None, None, _AMOUNT_ALIGNMENT, _AMOUNT_ALIGNMENT,
+                     _AMOUNT_ALIGNMENT, int(Qt.AlignCenter))
+_RESTE_COLUMN = 5
+# Visits fetched per page as the table is scrolled
+_VISIT_PAGE_SIZE = 50
+# Summary shown while a patient's visits are loading
+_EMPTY_VISIT_TOTALS = {'total_visits': 0, 'total_revenue': 0.0, 'total_paid': 0.0, 'total_unpaid': 0.0}
+
+# Custom role answering every painting role of a cell in one data() call
+_MULTIPLE_ROLES = Qt.UserRole + 1
+
+# Reste text colours, shared by every cell instead of allocated per row
+_UNPAID_BRUSH = QBrush(QColor(220, 20, 20))  # Dark red
+_PAID_BRUSH = QBrush(QColor(0, 150, 0))  # Dark green
+
+@lru_cache(maxsize=1)
+def _reste_font():
+    """Bold Reste font shared by every visits table (built on first use, once Qt is up)"""
+    font = QFont()
+    font.setBold(True)
+    font.setPointSize(10)
+    return font
+
+_GLYPH_ICON_SIZE = 16
+
+@lru_cache(maxsize=16)
+def _glyph_icon(glyph, color='#FFFFFF'):
+    """
+    Render a symbol glyph into an icon once per process, so button and tab labels stay
+    plain text instead of shaping emoji (and their fallback fonts) on every layout pass
+    """
+    pixmap = QPixmap(_GLYPH_ICON_SIZE, _GLYPH_ICON_SIZE)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    try:
+        painter.setRenderHint(QPainter.Antialiasing)
+        font = QFont()
+        font.setPixelSize(14)
+        painter.setFont(font)
+        painter.setPen(QColor(color))
+        painter.drawText(pixmap.rect(), Qt.AlignCenter, glyph)
+    finally:
+        painter.end()
+    return QIcon(pixmap)
+
+def _frameless_scroll_area(widget):
+    """Borderless, resizable scroll area around widget"""
+    scroll_area = QScrollArea()
+    scroll_area.setWidgetResizable(True)
+    scroll_area.setStyleSheet("QScrollArea { border: none; }")
+    scroll_area.setWidget(widget)
+    return scroll_area
+
+def _remember(cache, key, value):
+    """Store value as the most recent entry of an LRU OrderedDict, evicting the oldest"""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > _XRAY_CACHE_SIZE:
+        cache.popitem(last=False)
+
+def _visit_row(visit):
+    """Cell texts of a visit (the seven columns), followed by the numeric reste"""
+    reste_value = visit.reste if visit.reste is not None else 0.0
+    return (
+        visit.date.strftime("%d/%m/%Y") if visit.date else "",
+        visit.dent or "",
+        visit.acte or "",
+        f"{visit.prix:.2f}" if visit.prix else "0.00",
+        f"{visit.paye:.2f}" if visit.paye else "0.00",
+        f"{reste_value:.2f}",
+        "Modifier • Supprimer",
+        reste_value
+    )
+
+class VisitsTableModel(QAbstractTableModel):
+    """
+    Read-only model over a patient's visits; the cell texts are formatted once per visit
+    Further pages are fetched through fetchMore() as the view scrolls to the end
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._visits = []
+        # One _visit_row() tuple per loaded visit
+        self._rows = []
+        # Row -> per-column {role: value} dicts, built the first time a row is painted
+        self._role_maps = {}
+        self._total = 0
+        self._fetch_page = None
+    
+    def set_visits(self, visits, total=None, fetch_page=None, rows=None):
+        """
+        Replace the rows with visits (a list the model extends in place as pages arrive)
+        With fetch_page(offset, limit), rows up to total are fetched on demand;
+        rows are the visits' _visit_row() tuples when already formatted by the caller
+        """
+        self.beginResetModel()
+        self._visits = visits
+        self._rows = [_visit_row(visit) for visit in visits] if rows is None else list(rows)
+        self._role_maps = {}
+        self._total = len(visits) if total is None else total
+        self._fetch_page = fetch_page
+        self.endResetModel()
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        return (not parent.isValid() and self._fetch_page is not None
+                and len(self._rows) < self._total)
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        start = len(self._rows)
+        page = self._fetch_page(start, _VISIT_PAGE_SIZE)
+        if not page:
+            # History shrank since it was counted
+            self._total = start
+            return
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self._visits.extend(page)
+        self._rows.extend(_visit_row(visit) for visit in page)
+        self.endInsertRows()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(_VISIT_HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == _MULTIPLE_ROLES:
+            return self._row_role_maps(index.row())[index.column()]
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return row[column]
+        if role == Qt.TextAlignmentRole:
+            return _VISIT_ALIGNMENTS[column]
+        if column == _RESTE_COLUMN:
+            # Bold, red when unpaid and green when settled
+            if role == Qt.FontRole:
+                return _reste_font()
+            if role == Qt.ForegroundRole:
+                return _UNPAID_BRUSH if row[-1] > 0 else _PAID_BRUSH
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return _VISIT_HEADERS[section]
+        return None
+    
+    def _row_role_maps(self, row):
+        """Painting roles of every cell of a row, cached until the next set_visits"""
+        maps = self._role_maps.get(row)
+        if maps is None:
+            maps = []
+            for column in range(len(_VISIT_HEADERS)):
+                roles = {Qt.DisplayRole: self._rows[row][column]}
+                for role in (Qt.TextAlignmentRole, Qt.FontRole, Qt.ForegroundRole):
+                    value = self.data(self.index(row, column), role)
+                    if value is not None:
+                        roles[role] = value
+                maps.append(roles)
+            self._role_maps[row] = maps
+        return maps
+
+class VisitsItemDelegate(QStyledItemDelegate):
+    """Delegate filling the style option from one _MULTIPLE_ROLES lookup instead of a data() call per role"""
+    
+    def initStyleOption(self, option, index):
+        roles = index.data(_MULTIPLE_ROLES)
+        option.index = index
+        text = roles.get(Qt.DisplayRole)
+        if text is not None:
+            option.features |= QStyleOptionViewItem.HasDisplay
+            option.text = text
+        alignment = roles.get(Qt.TextAlignmentRole)
+        if alignment is not None:
+            option.displayAlignment = Qt.Alignment(alignment)
+        font = roles.get(Qt.FontRole)
+        if font is not None:
+            option.font = font.resolve(option.font)
+            option.fontMetrics = QFontMetrics(option.font)
+        brush = roles.get(Qt.ForegroundRole)
+        if brush is not None:
+            option.palette.setBrush(QPalette.Text, brush)
+
+class _XrayDecodeSignals(QObject):
+    decoded = pyqtSignal(object, object)  # cache key, QImage (null if unreadable)
+
+class _XrayDecodeWorker(QRunnable):
+    """Decode an X-ray file on the thread pool; QImage, since QPixmap is GUI-thread only"""
+    
+    def __init__(self, key, path):
+        super().__init__()
+        self.key = key
+        self.path = path
+        self.signals = _XrayDecodeSignals()
+    
+    def run(self):
+        self.signals.decoded.emit(self.key, QImage(self.path))
+
+class _VisitsLoadSignals(QObject):
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(int, str)  # generation, error message
+
+class _VisitsLoadWorker(QRunnable):
+    """Fetch a patient's first visits page and visit totals (count included) on the thread pool"""
+    
+    def __init__(self, visit_service, patient_id, generation):
+        super().__init__()
+        self.visit_service = visit_service
+        self.patient_id = patient_id
+        self.generation = generation
+        self.signals = _VisitsLoadSignals()
+    
+    def run(self):
+        try:
+            # The service opens a session per call, so it is safe to use from here
+            service = self.visit_service
+            totals = service.get_visit_totals(self.patient_id)
+            visits = service.get_visits_for_patient(self.patient_id, 0, _VISIT_PAGE_SIZE)
+            self.signals.loaded.emit({
+                'generation': self.generation,
+                'visits': visits,
+                # Cell texts are formatted here, off the GUI thread
+                'rows': [_visit_row(visit) for visit in visits],
+                'total': totals['total_visits'],
+                'totals': totals
+            })
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+
 class PatientDetailWidget(QWidget):
     """Widget for displaying detailed patient information and visit history"""
     
@@ -26,6 +447,14 @@ class PatientDetailWidget(QWidget):
     tooth_diagram_requested = pyqtSignal(int)  # Emits patient ID
     create_invoice_requested = pyqtSignal(int)  # Emits patient ID
     
+    # (patient_id, file mtime) -> decoded QPixmap, shared by every instance, least
+    # recently used first. Smooth-scaled copies live in Qt's QPixmapCache (bounded
+    # by memory); the most recent QPixmapCache keys -> patient_id are remembered so
+    # they can be dropped. Older keys are simply left to QPixmapCache's own eviction,
+    # and a replaced file gets a new mtime, hence new keys, anyway
+    _XRAY_CACHE = OrderedDict()
+    _SCALED_XRAY_KEYS = OrderedDict()
+    
     def __init__(self, patient_service, visit_service, tooth_service, invoice_service=None):
         super().__init__()
         self.patient_service = patient_service
@@ -34,21 +463,25 @@ class PatientDetailWidget(QWidget):
         self.invoice_service = invoice_service
         self.current_patient = None
         self.visits = []
+        self._visit_total = 0
+        # Cache key (patient_id, file mtime) of the X-ray currently shown, if any
+        self._xray_key = None
+        # Bumped on each load_visits so late results of an earlier load are dropped
+        self._visits_generation = 0
+        # Patient requested during the load_patient debounce window, if any
+        self._pending_patient_id = None
+        self._load_timer = QTimer(self)
+        self._load_timer.setSingleShot(True)
+        self._load_timer.timeout.connect(self._load_pending_patient)
         self.init_ui()
         
     def init_ui(self):
         """Initialize the user interface"""
-        # Main scroll area
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setStyleSheet("QScrollArea { border: none; }")
+        self.setStyleSheet(_DETAIL_SECTION_QSS)
         
-        # Main widget inside scroll area
-        main_widget = QWidget()
-        scroll_area.setWidget(main_widget)
-        
-        # Main layout
-        main_layout = QVBoxLayout(main_widget)
+        # Main layout; only the left column and the tooth diagram scroll, so the
+        # whole view is not repainted through an outer scroll area
+        main_layout = QVBoxLayout(self)
         main_layout.setSpacing(15)
         
         # Header section with patient info
@@ -65,8 +498,10 @@ class PatientDetailWidget(QWidget):
         self.create_patient_info_section(left_layout)
         self.create_xray_section(left_layout)
         
-        left_widget.setMaximumWidth(400)
-        splitter.addWidget(left_widget)
+        left_scroll = _frameless_scroll_area(left_widget)
+        left_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        left_scroll.setMaximumWidth(400)
+        splitter.addWidget(left_scroll)
         
         # Right side - Visits
         right_widget = QWidget()
@@ -74,59 +509,36 @@ class PatientDetailWidget(QWidget):
         
         # Create tab widget for tooth diagram and visit history
         self.tab_widget = QTabWidget()
-        self.tab_widget.setStyleSheet("""
-            QTabWidget::pane {
-                border: 1px solid #E5E7EB;
-                border-radius: 8px;
-                background-color: white;
-            }
-            QTabBar::tab {
-                background-color: #F3F4F6;
-                padding: 10px 20px;
-                margin-right: 2px;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-            }
-            QTabBar::tab:selected {
-                background-color: white;
-                border-bottom: 2px solid #3B82F6;
-            }
-        """)
-        
-        # Tooth diagram tab
+        self.tab_widget.setStyleSheet(_TAB_QSS)
+        
+        # Tooth diagram tab; the diagram is built the first time the tab is shown
+        # for a patient (see load_tooth_diagram)
         self.tooth_diagram_widget = None
-        self.tooth_tab = QWidget()
-        self.tooth_tab_layout = QVBoxLayout(self.tooth_tab)
-        self.tab_widget.addTab(self.tooth_tab, "🦷 Diagramme Dentaire")
+        self._tooth_diagrams = OrderedDict()
+        self._pending_tooth_patient_id = None
+        tooth_container = QWidget()
+        self.tooth_tab_layout = QVBoxLayout(tooth_container)
+        # The diagram has a large minimum size; scroll it inside its tab
+        self.tooth_tab = _frameless_scroll_area(tooth_container)
+        self.tab_widget.addTab(self.tooth_tab, _glyph_icon("🦷", '#374151'), "Diagramme Dentaire")
         
         # Visit history tab
         self.visit_tab = QWidget()
         self.setup_visit_history_tab()
-        self.tab_widget.addTab(self.visit_tab, "📋 Historique des Visites")
+        self.tab_widget.addTab(self.visit_tab, _glyph_icon("📋", '#374151'), "Historique des Visites")
         
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         right_layout.addWidget(self.tab_widget)
         
         splitter.addWidget(right_widget)
         splitter.setSizes([400, 800])
         
         main_layout.addWidget(splitter)
-        
-        # Set main layout
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(scroll_area)
     
     def create_patient_header(self, parent_layout):
         """Create the patient header section"""
         header_frame = QFrame()
-        header_frame.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                padding: 15px;
-            }
-        """)
+        header_frame.setStyleSheet(_HEADER_FRAME_QSS)
         header_layout = QHBoxLayout(header_frame)
         
         # Patient name and basic info
@@ -152,53 +564,17 @@ class PatientDetailWidget(QWidget):
         # Action buttons
         button_layout = QVBoxLayout()
         
-        self.edit_patient_btn = QPushButton("✏ Modifier Patient")
+        self.edit_patient_btn = QPushButton(_glyph_icon("✏"), "Modifier Patient")
         self.edit_patient_btn.clicked.connect(self.edit_patient)
-        self.edit_patient_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #1976D2;
-            }
-        """)
-        
-        self.add_visit_btn = QPushButton("➕ Nouvelle Visite")
+        self.edit_patient_btn.setStyleSheet(_BTN_PRIMARY_QSS)
+        
+        self.add_visit_btn = QPushButton(_glyph_icon("➕"), "Nouvelle Visite")
         self.add_visit_btn.clicked.connect(self.add_visit)
-        self.add_visit_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-        """)
-        
-        self.create_invoice_btn = QPushButton("📄 Créer Facture")
+        self.add_visit_btn.setStyleSheet(_BTN_SUCCESS_QSS)
+        
+        self.create_invoice_btn = QPushButton(_glyph_icon("📄"), "Créer Facture")
         self.create_invoice_btn.clicked.connect(self.create_invoice)
-        self.create_invoice_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #FF9800;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #F57C00;
-            }
-        """)
+        self.create_invoice_btn.setStyleSheet(_BTN_WARN_QSS)
         
         button_layout.addWidget(self.edit_patient_btn)
         button_layout.addWidget(self.add_visit_btn)
@@ -210,22 +586,7 @@ class PatientDetailWidget(QWidget):
     def create_patient_info_section(self, parent_layout):
         """Create the patient information section"""
         info_group = QGroupBox("Informations du Patient")
-        info_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 14px;
-                color: #2E7D32;
-                border: 2px solid #ddd;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
+        info_group.setObjectName("detailSection")
         
         info_layout = QFormLayout(info_group)
         info_layout.setSpacing(10)
@@ -249,14 +610,7 @@ class PatientDetailWidget(QWidget):
         self.observations_text = QTextEdit()
         self.observations_text.setReadOnly(True)
         self.observations_text.setMaximumHeight(100)
-        self.observations_text.setStyleSheet("""
-            QTextEdit {
-                border: 1px solid #ddd;
-                border-radius: 3px;
-                padding: 5px;
-                background-color: #f9f9f9;
-            }
-        """)
+        self.observations_text.setStyleSheet(_OBSERVATIONS_QSS)
         info_layout.addRow("Observations:", self.observations_text)
         
         parent_layout.addWidget(info_group)
@@ -264,22 +618,7 @@ class PatientDetailWidget(QWidget):
     def create_xray_section(self, parent_layout):
         """Create the X-ray section"""
         xray_group = QGroupBox("Radiographie")
-        xray_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 14px;
-                color: #2E7D32;
-                border: 2px solid #ddd;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
+        xray_group.setObjectName("detailSection")
         
         xray_layout = QVBoxLayout(xray_group)
         
@@ -287,60 +626,29 @@ class PatientDetailWidget(QWidget):
         self.xray_label = QLabel("Aucune radiographie")
         self.xray_label.setAlignment(Qt.AlignCenter)
         self.xray_label.setMinimumHeight(200)
-        self.xray_label.setStyleSheet("""
-            QLabel {
-                border: 2px dashed #ddd;
-                border-radius: 5px;
-                background-color: #f9f9f9;
-                color: #666;
-            }
-        """)
+        self.xray_label.setStyleSheet(_XRAY_LABEL_QSS)
+        # Follow the label's width (e.g. the splitter) rather than pinning it to the pixmap
+        self.xray_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Preferred)
+        self.xray_label.installEventFilter(self)
         xray_layout.addWidget(self.xray_label)
         
+        # Live resizes use a fast rescale; the smooth one runs once they settle
+        self._xray_smooth_timer = QTimer(self)
+        self._xray_smooth_timer.setSingleShot(True)
+        self._xray_smooth_timer.timeout.connect(self._display_smooth_xray)
+        
         # X-ray buttons
         xray_button_layout = QHBoxLayout()
         
-        self.upload_xray_btn = QPushButton("📁 Télécharger")
+        self.upload_xray_btn = QPushButton(_glyph_icon("📁"), "Télécharger")
         self.upload_xray_btn.clicked.connect(self.upload_xray)
         
-        self.delete_xray_btn = QPushButton("🗑 Supprimer")
+        self.delete_xray_btn = QPushButton(_glyph_icon("🗑"), "Supprimer")
         self.delete_xray_btn.clicked.connect(self.delete_xray)
         self.delete_xray_btn.setEnabled(False)
         
-        for btn in [self.upload_xray_btn, self.delete_xray_btn]:
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #2196F3;
-                    color: white;
-                    border: none;
-                    padding: 8px 12px;
-                    border-radius: 3px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #1976D2;
-                }
-                QPushButton:disabled {
-                    background-color: #cccccc;
-                }
-            """)
-        
-        self.delete_xray_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f44336;
-                color: white;
-                border: none;
-                padding: 8px 12px;
-                border-radius: 3px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #d32f2f;
-            }
-            QPushButton:disabled {
-                background-color: #cccccc;
-            }
-        """)
+        self.upload_xray_btn.setStyleSheet(_XRAY_BTN_QSS)
+        self.delete_xray_btn.setStyleSheet(_XRAY_DELETE_BTN_QSS)
         
         xray_button_layout.addWidget(self.upload_xray_btn)
         xray_button_layout.addWidget(self.delete_xray_btn)
@@ -352,57 +660,18 @@ class PatientDetailWidget(QWidget):
     def create_visits_section(self, parent_layout):
         """Create the visits section"""
         visits_group = QGroupBox("Historique des Visites")
-        visits_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 14px;
-                color: #2E7D32;
-                border: 2px solid #ddd;
-                border-radius: 5px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
+        visits_group.setObjectName("detailSection")
         
         visits_layout = QVBoxLayout(visits_group)
         
-        # Visits table
-        self.visits_table = QTableWidget()
-        self.visits_table.setColumnCount(7)
-        self.visits_table.setHorizontalHeaderLabels([
-            "Date", "Dent", "Acte", "Prix", "Payé", "Reste", "Actions"
-        ])
+        # Visits table; the view only asks the model for the rows it paints
+        self._visits_model = VisitsTableModel(self)
+        self.visits_table = QTableView()
+        self.visits_table.setModel(self._visits_model)
+        self.visits_table.setItemDelegate(VisitsItemDelegate(self.visits_table))
         
         # Table styling
-        self.visits_table.setStyleSheet("""
-            QTableWidget {
-                background-color: white;
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                gridline-color: #e0e0e0;
-                selection-background-color: #E8F5E8;
-            }
-            QTableWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #e0e0e0;
-            }
-            QTableWidget::item:selected {
-                background-color: #E8F5E8;
-                color: #2E7D32;
-            }
-            QHeaderView::section {
-                background-color: #4CAF50;
-                color: white;
-                padding: 10px;
-                border: none;
-                font-weight: bold;
-            }
-        """)
+        self.visits_table.setStyleSheet(_VISITS_TABLE_QSS)
         
         # Table properties
         self.visits_table.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -413,13 +682,12 @@ class PatientDetailWidget(QWidget):
         
         # Auto-resize columns
         header = self.visits_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # Date
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)  # Dent
+        for column in _CONTENT_SIZED_VISIT_COLUMNS:
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(2, QHeaderView.Stretch)  # Acte
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Prix
-        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # Payé
         header.setSectionResizeMode(5, QHeaderView.Fixed)  # Reste - Fixed width
-        header.setSectionResizeMode(6, QHeaderView.ResizeToContents)  # Actions
+        # Fit the content-sized columns to the visible rows only
+        header.setResizeContentsPrecision(0)
         
         # Set minimum column widths to ensure visibility
         self.visits_table.setColumnWidth(0, 80)   # Date
@@ -430,7 +698,7 @@ class PatientDetailWidget(QWidget):
         self.visits_table.setColumnWidth(6, 120)  # Actions
         
         # Table events
-        self.visits_table.cellDoubleClicked.connect(self.on_visit_double_click)
+        self.visits_table.doubleClicked.connect(self.on_visit_double_click)
         self.visits_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.visits_table.customContextMenuRequested.connect(self.show_visit_context_menu)
         
@@ -446,7 +714,7 @@ class PatientDetailWidget(QWidget):
         
         for label in [self.total_visits_label, self.total_revenue_label, 
                      self.total_paid_label, self.total_unpaid_label]:
-            label.setStyleSheet("font-weight: bold; color: #2E7D32; padding: 5px;")
+            label.setStyleSheet(_SUMMARY_LABEL_QSS)
         
         summary_layout.addWidget(self.total_visits_label)
         summary_layout.addWidget(self.total_revenue_label)
@@ -465,7 +733,26 @@ class PatientDetailWidget(QWidget):
         self.create_visits_section(visit_layout)
     
     def load_patient(self, patient_id):
-        """Load patient data and visits"""
+        """
+        Load patient data and visits; the first call loads at once, further calls within
+        _LOAD_DEBOUNCE_MS are coalesced so only the last of a burst is loaded
+        """
+        if self._load_timer.isActive():
+            self._pending_patient_id = patient_id
+            self._load_timer.start(_LOAD_DEBOUNCE_MS)
+            return
+        self._load_timer.start(_LOAD_DEBOUNCE_MS)
+        self.load_patient_immediate(patient_id)
+    
+    def _load_pending_patient(self):
+        """Load the last patient requested during the debounce window"""
+        if self._pending_patient_id is not None:
+            patient_id, self._pending_patient_id = self._pending_patient_id, None
+            self.load_patient_immediate(patient_id)
+    
+    def load_patient_immediate(self, patient_id):
+        """Load patient data and visits now, bypassing the debounce"""
+        self._pending_patient_id = None
         patient = self.patient_service.get_patient_by_id(patient_id)
         if not patient:
             QMessageBox.critical(self, "Erreur", "Patient non trouvé")
@@ -505,115 +792,188 @@ class PatientDetailWidget(QWidget):
         if not self.current_patient:
             return
         
+        self._xray_key = None
         if self.current_patient.xray_photo:
             xray_path = self.patient_service.get_xray_path(self.current_patient.id)
             if xray_path and os.path.exists(xray_path):
-                pixmap = QPixmap(xray_path)
-                if not pixmap.isNull():
-                    # Scale image to fit label while maintaining aspect ratio
-                    scaled_pixmap = pixmap.scaled(
-                        self.xray_label.size(), 
-                        Qt.KeepAspectRatio, 
-                        Qt.SmoothTransformation
-                    )
-                    self.xray_label.setPixmap(scaled_pixmap)
-                    self.xray_label.setText("")
-                    self.delete_xray_btn.setEnabled(True)
-                    return
-        
+                key = (self.current_patient.id, os.path.getmtime(xray_path))
+                self._xray_key = key
+                self.delete_xray_btn.setEnabled(True)
+                if key in self._XRAY_CACHE:
+                    self._display_xray(Qt.SmoothTransformation)
+                else:
+                    # Decode off the GUI thread; _on_xray_decoded shows the result
+                    self.xray_label.clear()
+                    self.xray_label.setText("Chargement de la radiographie...")
+                    worker = _XrayDecodeWorker(key, xray_path)
+                    worker.signals.decoded.connect(self._on_xray_decoded)
+                    QThreadPool.globalInstance().start(worker)
+                return
+        
+        self._show_no_xray()
+    
+    def _show_no_xray(self):
+        """Show the empty X-ray placeholder"""
         # No image or image not found
+        self._xray_key = None
         self.xray_label.clear()
         self.xray_label.setText("Aucune radiographie")
         self.delete_xray_btn.setEnabled(False)
     
+    def _on_xray_decoded(self, key, image):
+        """Cache and show a decoded X-ray unless another one was requested meanwhile"""
+        if key != self._xray_key:
+            return
+        if image.isNull():
+            self._show_no_xray()
+            return
+        _remember(self._XRAY_CACHE, key, QPixmap.fromImage(image))
+        self._display_xray(Qt.SmoothTransformation)
+    
+    def _display_xray(self, mode):
+        """Show the current X-ray scaled to the label with the given transformation; False if not decoded"""
+        if self._xray_key is None:
+            return False
+        scaled_pixmap = self._scaled_xray(self._xray_key, mode)
+        if scaled_pixmap is None:
+            return False
+        self.xray_label.setPixmap(scaled_pixmap)
+        return True
+    
+    def _display_smooth_xray(self):
+        """Replace the fast-scaled X-ray shown during a resize with the smooth one"""
+        self._display_xray(Qt.SmoothTransformation)
+    
+    def eventFilter(self, obj, event):
+        """Rescale the X-ray quickly while its label is being resized"""
+        if obj is self.xray_label and event.type() == QEvent.Resize and self._xray_key is not None:
+            self._display_xray(Qt.FastTransformation)
+            self._xray_smooth_timer.start(_XRAY_SMOOTH_DELAY_MS)
+        return super().eventFilter(obj, event)
+    
+    def _scaled_xray(self, key, mode=Qt.SmoothTransformation):
+        """
+        Decoded X-ray scaled to fit inside the label's border; None if not decoded yet
+        Smooth results are cached, fast ones are cheap to redo
+        """
+        size = self.xray_label.contentsRect().size()
+        patient_id, mtime = key
+        scaled_key = f"xray:{patient_id}:{mtime}:{size.width()}x{size.height()}"
+        
+        if mode == Qt.SmoothTransformation:
+            scaled_pixmap = QPixmapCache.find(scaled_key)
+            if scaled_pixmap is not None and not scaled_pixmap.isNull():
+                return scaled_pixmap
+        
+        pixmap = self._XRAY_CACHE.get(key)
+        if pixmap is None:
+            return None
+        _remember(self._XRAY_CACHE, key, pixmap)
+        # Scale image to fit label while maintaining aspect ratio
+        scaled_pixmap = pixmap.scaled(size, Qt.KeepAspectRatio, mode)
+        if mode == Qt.SmoothTransformation and QPixmapCache.insert(scaled_key, scaled_pixmap):
+            _remember(self._SCALED_XRAY_KEYS, scaled_key, patient_id)
+        return scaled_pixmap
+    
+    @classmethod
+    def _forget_xray(cls, patient_id):
+        """Drop the cached images of a patient whose X-ray was replaced or deleted"""
+        for key in [key for key in cls._XRAY_CACHE if key[0] == patient_id]:
+            del cls._XRAY_CACHE[key]
+        for scaled_key in [key for key, owner in cls._SCALED_XRAY_KEYS.items() if owner == patient_id]:
+            del cls._SCALED_XRAY_KEYS[scaled_key]
+            QPixmapCache.remove(scaled_key)
+    
     def load_visits(self):
         """Load visits for the current patient"""
         if not self.current_patient:
             return
         
-        self.visits = self.visit_service.get_visits_for_patient(self.current_patient.id)
-        self.populate_visits_table()
-        self.update_visit_summary()
+        # Empty the table first, so nothing (double-click, context menu) acts on the
+        # previous patient's visits while this patient's are loading
+        self.visits = []
+        self._visit_total = 0
+        self._visits_model.set_visits(self.visits, 0)
+        self.update_visit_summary(_EMPTY_VISIT_TOTALS)
+        
+        # Only the first page is fetched, on the thread pool; the table model fetches
+        # the rest on scroll and extends self.visits in place
+        self._visits_generation += 1
+        worker = _VisitsLoadWorker(self.visit_service, self.current_patient.id, self._visits_generation)
+        worker.signals.loaded.connect(self._on_visits_loaded)
+        worker.signals.failed.connect(self._on_visits_load_failed)
+        QThreadPool.globalInstance().start(worker)
+    
+    def _on_visits_loaded(self, payload):
+        """Show the visits fetched by load_visits unless a newer load was started since"""
+        if payload['generation'] != self._visits_generation or not self.current_patient:
+            return
+        self.visits = payload['visits']
+        self._visit_total = payload['total']
+        self.populate_visits_table(payload['rows'])
+        self.update_visit_summary(payload['totals'])
+    
+    def _on_visits_load_failed(self, generation, message):
+        """Report a background visits load error unless a newer load was started since"""
+        if generation != self._visits_generation:
+            return
+        QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement des visites: {message}")
     
     def load_tooth_diagram(self):
-        """Load tooth diagram for the current patient"""
+        """Show the current patient's tooth diagram, building it only once its tab is visible"""
         if not self.current_patient:
             return
         
-        # Clear existing widgets from tooth tab layout
-        while self.tooth_tab_layout.count():
-            child = self.tooth_tab_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        # Create and add tooth diagram widget
-        self.tooth_diagram_widget = ToothDiagramWidget(self.tooth_service, self.current_patient.id)
-        self.tooth_tab_layout.addWidget(self.tooth_diagram_widget)
+        self._pending_tooth_patient_id = self.current_patient.id
+        if self.tab_widget.currentWidget() is self.tooth_tab:
+            self._build_tooth_diagram()
     
-    def populate_visits_table(self):
-        """Populate the visits table"""
-        self.visits_table.setRowCount(len(self.visits))
-        
-        for row, visit in enumerate(self.visits):
-            # Date
-            date_str = visit.date.strftime("%d/%m/%Y") if visit.date else ""
-            self.visits_table.setItem(row, 0, QTableWidgetItem(date_str))
-            
-            # Dent (tooth number)
-            self.visits_table.setItem(row, 1, QTableWidgetItem(visit.dent or ""))
-            
-            # Acte
-            self.visits_table.setItem(row, 2, QTableWidgetItem(visit.acte or ""))
-            
-            # Prix
-            prix_item = QTableWidgetItem(f"{visit.prix:.2f}" if visit.prix else "0.00")
-            prix_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.visits_table.setItem(row, 3, prix_item)
-            
-            # Payé
-            paye_item = QTableWidgetItem(f"{visit.paye:.2f}" if visit.paye else "0.00")
-            paye_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.visits_table.setItem(row, 4, paye_item)
-            
-            # Reste
-            reste_value = visit.reste if visit.reste is not None else 0.0
-            reste_item = QTableWidgetItem(f"{reste_value:.2f}")
-            reste_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            
-            # Make text bold and visible
-            font = reste_item.font()
-            font.setBold(True)
-            font.setPointSize(10)
-            reste_item.setFont(font)
-            
-            # Simple color coding without background - just text color
-            if reste_value > 0:
-                # Red text for unpaid amounts
-                reste_item.setForeground(QBrush(QColor(220, 20, 20)))  # Dark red
-            else:
-                # Green text for paid amounts
-                reste_item.setForeground(QBrush(QColor(0, 150, 0)))  # Dark green
-            
-            self.visits_table.setItem(row, 5, reste_item)
-            
-            # Actions
-            actions_item = QTableWidgetItem("Modifier • Supprimer")
-            actions_item.setTextAlignment(Qt.AlignCenter)
-            self.visits_table.setItem(row, 6, actions_item)
-
-    def update_visit_summary(self):
-        """Update visit summary statistics"""
-        if not self.visits:
-            self.total_visits_label.setText("Total visites: 0")
-            self.total_revenue_label.setText("Chiffre d'affaires: 0.00 DH")
-            self.total_paid_label.setText("Total payé: 0.00 DH")
-            self.total_unpaid_label.setText("Total impayé: 0.00 DH")
+    def _on_tab_changed(self, index):
+        """Build the pending tooth diagram when its tab becomes current"""
+        if self.tab_widget.widget(index) is self.tooth_tab:
+            self._build_tooth_diagram()
+    
+    def _build_tooth_diagram(self):
+        """Put the pending patient's tooth diagram in the tab, reusing a recent one if cached"""
+        patient_id = self._pending_tooth_patient_id
+        if patient_id is None:
+            return
+        if self.tooth_diagram_widget is not None and self.tooth_diagram_widget.patient_id == patient_id:
             return
         
-        total_visits = len(self.visits)
-        total_revenue = sum(visit.prix or 0 for visit in self.visits)
-        total_paid = sum(visit.paye or 0 for visit in self.visits)
-        total_unpaid = sum(visit.reste or 0 for visit in self.visits)
+        if self.tooth_diagram_widget is not None:
+            self.tooth_tab_layout.removeWidget(self.tooth_diagram_widget)
+            self.tooth_diagram_widget.hide()
+        
+        # Diagrams only change through their own widget, so a cached one is still current
+        widget = self._tooth_diagrams.pop(patient_id, None)
+        if widget is None:
+            widget = ToothDiagramWidget(self.tooth_service, patient_id)
+        self._tooth_diagrams[patient_id] = widget
+        while len(self._tooth_diagrams) > _TOOTH_DIAGRAM_CACHE_SIZE:
+            _, evicted = self._tooth_diagrams.popitem(last=False)
+            evicted.deleteLater()
+        
+        self.tooth_diagram_widget = widget
+        self.tooth_tab_layout.addWidget(widget)
+        widget.show()
+    
+    def populate_visits_table(self, rows=None):
+        """Populate the visits table; rows are the visits' preformatted cell texts, if available"""
+        self._visits_model.set_visits(
+            self.visits,
+            self._visit_total,
+            partial(self.visit_service.get_visits_for_patient, self.current_patient.id),
+            rows
+        )
+    
+    def update_visit_summary(self, totals):
+        """Update visit summary statistics from get_visit_totals() results"""
+        # Aggregated in SQL, so it covers the whole history without loading it
+        total_visits = totals['total_visits']
+        total_revenue = totals['total_revenue']
+        total_paid = totals['total_paid']
+        total_unpaid = totals['total_unpaid']
         
         self.total_visits_label.setText(f"Total visites: {total_visits}")
         self.total_revenue_label.setText(f"Chiffre d'affaires: {total_revenue:.2f} DH")
@@ -653,6 +1013,7 @@ class PatientDetailWidget(QWidget):
             success, message = self.patient_service.upload_xray(self.current_patient.id, file_path)
             
             if success:
+                self._forget_xray(self.current_patient.id)
                 QMessageBox.information(self, "Succès", message)
                 # Reload the image
                 self.load_xray_image()
@@ -676,20 +1037,22 @@ class PatientDetailWidget(QWidget):
             success, message = self.patient_service.delete_xray(self.current_patient.id)
             
             if success:
+                self._forget_xray(self.current_patient.id)
                 QMessageBox.information(self, "Succès", message)
                 self.load_xray_image()
             else:
                 QMessageBox.critical(self, "Erreur", message)
     
-    def on_visit_double_click(self, row, column):
+    def on_visit_double_click(self, index):
         """Handle double-click on visit row"""
-        if row < len(self.visits):
+        row = index.row()
+        if 0 <= row < len(self.visits):
             visit = self.visits[row]
             self.edit_visit_requested.emit(visit.id)
     
     def show_visit_context_menu(self, position):
         """Show context menu for visits table"""
-        if self.visits_table.itemAt(position):
+        if self.visits_table.indexAt(position).isValid():
             menu = QMenu(self)
             
             edit_action = menu.addAction("Modifier visite")
@@ -766,8 +1129,12 @@ class PatientDetailWidget(QWidget):
         )
         layout.addWidget(invoice_widget)
         
-        # Connect invoice created signal
-        invoice_widget.invoice_created.connect(lambda path: dialog.accept())
+        # Close the dialog once the invoice is created; a bound slot rather than a
+        # lambda, so the connection can be broken and nothing keeps the dialog alive
+        invoice_widget.invoice_created.connect(dialog.accept)
         
         # Show dialog
         dialog.exec_()
+        
+        invoice_widget.invoice_created.disconnect(dialog.accept)
+        dialog.deleteLater()
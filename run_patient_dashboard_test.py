@@ -88,17 +88,17 @@ def main():
     # Real service reusing our session
     service = RealDashboardService(session=session)
 
-    # Instantiate the dashboard widget
+    # Instantiate the dashboard widget; it loads nothing until its host asks,
+    # so fetch and apply synchronously here since no event loop is started
     widget = PatientDashboardWidget(dashboard_service=service)
+    payload = widget.fetch_data()
+    widget.apply_data(payload)
 
     # Extract KPI values
-    kpis = []
-    if hasattr(widget, 'metric_cards'):
-        for card in widget.metric_cards[:5]:
-            kpis.append(card.value_label.text())
+    kpis = [label.text() for label in widget._value_labels]
 
-    # Extract registration trend using the widget's helper
-    months, counts = widget._month_labels_and_counts(months=6)
+    # Extract registration trend from the payload the widget displays
+    months, counts = payload['months'], payload['counts'].tolist()
 
     print('KPI Values (Total, Ce Mois, Par Mois, Par An, Récents):')
     print(', '.join(kpis))